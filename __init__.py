@@ -27,17 +27,32 @@ bl_info = {
 }
 
 # Import necessary modules
+import os
+import tempfile
 import bpy
-from bpy.props import StringProperty, BoolProperty, IntProperty, FloatProperty, EnumProperty
+from bpy.props import StringProperty, BoolProperty, IntProperty, FloatProperty, EnumProperty, CollectionProperty
 from .utils import NoiseParamsUpdater, update_display_aspect
-from .operators import NOISE_OT_generate_perlin, NOISE_OT_generate_voronoii, NOISE_OT_add_to_shader
+from .operators import NOISE_OT_generate_perlin, NOISE_OT_generate_voronoii, NOISE_OT_add_to_shader, NOISE_OT_clear_cache, NOISE_OT_export
+from .operators import NOISE_OT_queue_generate, NOISE_OT_clear_jobs, NOISE_OT_generate_to_disk
+from .operators import NOISE_OT_add_animation_track, NOISE_OT_remove_animation_track, NOISE_OT_bake_animation
 from .panels import NOISE_PT_main_panel
+from .animation import NoiseAnimationTrack
+from . import procedural, recipe_undo, animation
 
 
 classes = (
+    NoiseAnimationTrack,
     NOISE_OT_generate_perlin,
     NOISE_OT_generate_voronoii,
     NOISE_OT_add_to_shader,
+    NOISE_OT_clear_cache,
+    NOISE_OT_export,
+    NOISE_OT_queue_generate,
+    NOISE_OT_clear_jobs,
+    NOISE_OT_generate_to_disk,
+    NOISE_OT_add_animation_track,
+    NOISE_OT_remove_animation_track,
+    NOISE_OT_bake_animation,
     NOISE_PT_main_panel,
 )
 
@@ -63,6 +78,15 @@ def register():
     bpy.types.Scene.noise_height = IntProperty(default=512, min=64, max=8192)
     bpy.types.Scene.noise_period = FloatProperty(default=64.0, min=1.0, max=1000.0)
     bpy.types.Scene.noise_seed = IntProperty(default=1, min=0)
+    bpy.types.Scene.noise_seed_mode = EnumProperty(
+        name="Seed Mode",
+        items=[
+            ('SEQUENTIAL', "Sequential", "Lattice values drawn in order from one random stream (original look)"),
+            ('HASHED', "Hashed", "Every lattice value hashed from its cell, channel and octave (no tables, any part can be generated alone)"),
+        ],
+        default='SEQUENTIAL',
+        description="How random lattice values are derived from the seed"
+    )
     bpy.types.Scene.noise_generator_last_image = StringProperty()
     bpy.types.Scene.noise_depth = IntProperty(default=4, min=1, max=8)
     bpy.types.Scene.noise_lacunarity = FloatProperty(default=2.0, min=1.0, max=64.0)
@@ -71,6 +95,37 @@ def register():
     bpy.types.Scene.noise_use_alpha = BoolProperty(default=False)
     bpy.types.Scene.noise_absolute = BoolProperty(default=False)
     bpy.types.Scene.noise_turbulence = BoolProperty(default=False)
+    bpy.types.Scene.noise_engine = EnumProperty(
+        name="Engine",
+        items=[
+            ('LATTICE', "Lattice", "Perlin noise, one lattice per layer (tiles when Scale divides the image size)"),
+            ('SPECTRAL', "Spectral", "Fractal noise synthesized with an FFT: tiles at any size, cost independent of depth"),
+        ],
+        default='LATTICE',
+        description="How the noise is computed"
+    )
+    bpy.types.Scene.noise_band_limited = BoolProperty(
+        name="Band Limited",
+        default=False,
+        description="Skip octaves finer than 2 pixels and fade out those close to it (faster, less aliasing)"
+    )
+    bpy.types.Scene.noise_derivative_output = EnumProperty(
+        name="Output",
+        items=[
+            ('NONE', "Height", "Noise values"),
+            ('NORMAL', "Normal Map", "Tangent space normal map from the analytic slopes of the noise, height in alpha"),
+            ('FLOW', "Flow Map", "Flow along the contour lines of the noise in RG, height in alpha"),
+        ],
+        default='NONE',
+        description="What is written to the image"
+    )
+    bpy.types.Scene.noise_normal_strength = FloatProperty(
+        name="Strength",
+        default=1.0,
+        min=0.0,
+        max=100.0,
+        description="Slope multiplier of normal and flow maps"
+    )
     bpy.types.Scene.noise_correct_aspect = BoolProperty(
         default=True,
         update=update_display_aspect,
@@ -80,7 +135,7 @@ def register():
         name="Noise Type",
         items=[
             ('PERLIN', "Perlin", "Generate Perlin noise"),
-            ('VORONOII', Voronoioi", "GeneratVoronoinoi noise"),
+            ('VORONOII', "Voronoi", "Generate Voronoi noise"),
         ],
         default='PERLIN'
     )
@@ -93,6 +148,8 @@ def register():
             ('1', "Minkowski Distance", "Distance to the closest point using Minkowski distance"),
             ('2', "Cell Pattern (Euclidean)", "Difference between closest and second closest point using Euclidean distance"),
             ('3', "Cell Pattern (Minkowski)", "Difference between closest and second closest point using Minkowski distance"),
+            ('4', "Chebyshev Distance", "Distance to the closest point using Chebyshev distance"),
+            ('5', "Cell Pattern (Chebyshev)", "Difference between closest and second closest point using Chebyshev distance"),
         ],
         default='0'
     )
@@ -103,15 +160,146 @@ def register():
         max=10.0,
         description="Exponent for Minkowski distance calculation"
     )
+    bpy.types.Scene.noise_normalization = EnumProperty(
+        name="Normalization",
+        items=[
+            ('GLOBAL', "Global", "Stretch the min/max of the whole image to 0-1"),
+            ('CHANNEL', "Per Channel", "Stretch the min/max of every channel to 0-1"),
+            ('ANALYTIC', "Analytic", "Use theoretical bounds of the noise, no pass over the image (tile independent)"),
+        ],
+        default='GLOBAL'
+    )
+    bpy.types.Scene.noise_alpha_source = EnumProperty(
+        name="Alpha Source",
+        items=[
+            ('INDEPENDENT', "Independent", "A second Voronoi field with its own points (original look, costs a second search)"),
+            ('F2', "F2", "Distance to the second closest point"),
+            ('F2_F1', "F2 - F1", "Difference between the second closest and the closest point distances"),
+            ('EDGE', "Edge Distance", "Distance to the edge between the closest and the second closest point"),
+            ('CELL_ID', "Cell Value", "A random value per cell"),
+        ],
+        default='INDEPENDENT'
+    )
     bpy.types.Scene.noise_smoothness = FloatProperty(default=0.0, min=0.0, max=1.0)
     bpy.types.Scene.noise_randomness = FloatProperty(default=1.0, min=0.0, max=1.0)
     bpy.types.Scene.noise_active_image = StringProperty()
     bpy.types.Scene.noise_name_exists = BoolProperty(default=False)
-    NoiseParamsUpdater.start_polling()
+    bpy.types.Scene.noise_cache_enabled = BoolProperty(
+        name="Use Cache",
+        default=False,
+        description="Reuse generated textures with identical parameters from the disk cache"
+    )
+    bpy.types.Scene.noise_cache_dir = StringProperty(
+        name="Cache Directory",
+        default=os.path.join(tempfile.gettempdir(), "tilable_noise_cache"),
+        subtype='DIR_PATH'
+    )
+    bpy.types.Scene.noise_cache_size = IntProperty(
+        name="Cache Size (MB)",
+        default=2048,
+        min=16,
+        description="Least recently used textures are removed above this size"
+    )
+    bpy.types.Scene.noise_memory_budget = IntProperty(
+        name="Memory Budget (MB)",
+        default=4096,
+        min=64,
+        description="Generation is split into row bands to stay below this; larger requests are refused"
+    )
+    bpy.types.Scene.noise_storage = EnumProperty(
+        name="Storage",
+        items=[
+            ('BYTE', "8 bit", "Byte image, smallest in memory and in the .blend"),
+            ('HALF', "Half Float", "16 bit float image"),
+            ('FLOAT', "Float", "32 bit float image"),
+        ],
+        default='BYTE',
+        description="Pixel format of the generated image"
+    )
+    bpy.types.Scene.noise_procedural = BoolProperty(
+        name="Procedural",
+        default=False,
+        description="Save only the noise settings in the .blend and regenerate the pixels when needed"
+    )
+    bpy.types.Scene.noise_recipe_undo = BoolProperty(
+        name="Recipe Undo",
+        default=False,
+        description="Undo generations by restoring pixels from their settings instead of keeping image copies in the undo history (images are stored procedurally)"
+    )
+    bpy.types.Scene.noise_job_workers = IntProperty(
+        name="Job Workers",
+        default=2,
+        min=1,
+        max=16,
+        description="Number of queued images generated at the same time (each gets a share of the memory budget)"
+    )
+    bpy.types.Scene.noise_export_dir = StringProperty(
+        name="Export Directory",
+        default="//textures/",
+        subtype='DIR_PATH'
+    )
+    bpy.types.Scene.noise_export_format = EnumProperty(
+        name="Export Format",
+        items=[
+            ('EXR', "OpenEXR (Half)", "Half float OpenEXR"),
+            ('PNG16', "PNG (16 bit)", "16 bit RGBA PNG"),
+            ('RAW', "Raw Float", "Headerless float32 RGBA, top row first"),
+        ],
+        default='EXR'
+    )
+    bpy.types.Scene.noise_export_workers = IntProperty(
+        name="Export Workers",
+        default=4,
+        min=1,
+        max=32,
+        description="Number of textures encoded and written at the same time"
+    )
+    bpy.types.Scene.noise_disk_width = IntProperty(
+        name="Disk Width",
+        default=16384,
+        min=64,
+        max=65536,
+        description="Width of textures generated to disk, which may be larger than memory"
+    )
+    bpy.types.Scene.noise_disk_height = IntProperty(
+        name="Disk Height",
+        default=16384,
+        min=64,
+        max=65536,
+        description="Height of textures generated to disk, which may be larger than memory"
+    )
+    bpy.types.Scene.noise_disk_tile_size = IntProperty(
+        name="Tile Size",
+        default=0,
+        min=0,
+        max=65536,
+        description="Split textures generated to disk into tiles of this size (0 writes a single file)"
+    )
+    bpy.types.Scene.noise_disk_keep_npy = BoolProperty(
+        name="Keep .npy",
+        default=False,
+        description="Keep the memory-mapped .npy raster next to the exported texture"
+    )
+    bpy.types.Scene.noise_anim_tracks = CollectionProperty(type=NoiseAnimationTrack)
+    bpy.types.Scene.noise_anim_cache_size = IntProperty(
+        name="Frame Cache (MB)",
+        default=1024,
+        min=16,
+        description="Generated animation frames kept in memory; least recently used frames are dropped above this size"
+    )
+    # NoiseParamsUpdater starts polling when a file is loaded or the panel is first drawn
+    # Animated images get their frame's params in render_pre before procedural.render_pre
+    # regenerates whatever is still missing
+    animation.register_handlers()
+    procedural.register_handlers()
+    recipe_undo.register_handlers()
 
 
 def unregister():
     NoiseParamsUpdater.stop_polling()
+    procedural.unregister_handlers()
+    recipe_undo.unregister_handlers()
+    animation.unregister_handlers()
     
     # Unregister classes
     for cls in reversed(classes):
@@ -124,14 +312,19 @@ def unregister():
     del bpy.types.Scene.noise_height
     del bpy.types.Scene.noise_period
     del bpy.types.Scene.noise_seed
+    del bpy.types.Scene.noise_seed_mode
     del bpy.types.Scene.noise_generator_last_image
     del bpy.types.Scene.noise_depth    
     del bpy.types.Scene.noise_lacunarity
     del bpy.types.Scene.noise_atten
+    del bpy.types.Scene.noise_band_limited
+    del bpy.types.Scene.noise_derivative_output
+    del bpy.types.Scene.noise_normal_strength
     del bpy.types.Scene.noise_use_color
     del bpy.types.Scene.noise_use_alpha
     del bpy.types.Scene.noise_absolute
     del bpy.types.Scene.noise_turbulence
+    del bpy.types.Scene.noise_engine
     del bpy.types.Scene.noise_correct_aspect
     
     del bpy.types.Scene.noise_type
@@ -139,7 +332,26 @@ def unregister():
     del bpy.types.Scene.noise_fbm_iterations
     del bpy.types.Scene.noise_return_type
     del bpy.types.Scene.noise_minkowski_exponent
+    del bpy.types.Scene.noise_normalization
+    del bpy.types.Scene.noise_alpha_source
     del bpy.types.Scene.noise_smoothness
     del bpy.types.Scene.noise_randomness
     del bpy.types.Scene.noise_active_image
-    del bpy.types.Scene.noise_name_exists
\ No newline at end of file
+    del bpy.types.Scene.noise_name_exists
+    del bpy.types.Scene.noise_cache_enabled
+    del bpy.types.Scene.noise_cache_dir
+    del bpy.types.Scene.noise_cache_size
+    del bpy.types.Scene.noise_memory_budget
+    del bpy.types.Scene.noise_storage
+    del bpy.types.Scene.noise_procedural
+    del bpy.types.Scene.noise_recipe_undo
+    del bpy.types.Scene.noise_job_workers
+    del bpy.types.Scene.noise_export_dir
+    del bpy.types.Scene.noise_export_format
+    del bpy.types.Scene.noise_export_workers
+    del bpy.types.Scene.noise_disk_width
+    del bpy.types.Scene.noise_disk_height
+    del bpy.types.Scene.noise_disk_tile_size
+    del bpy.types.Scene.noise_disk_keep_npy
+    del bpy.types.Scene.noise_anim_tracks
+    del bpy.types.Scene.noise_anim_cache_size
\ No newline at end of file
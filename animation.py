@@ -0,0 +1,215 @@
+"""Noise parameters animated over the frame range.
+
+Images can't hold animation data, so every animated image gets a track in the scene's
+noise_anim_tracks collection; its seed, period and frequency are scene properties that
+can be keyframed like any other. On every frame change the tracked images are refilled
+with their params at that frame, read from a bounded in-memory cache of frames (backed
+by the disk cache when that is enabled), so scrubbing back or re-rendering a frame
+doesn't generate it again. The bake operator fills the cache for the whole frame range
+in background jobs ahead of a render.
+
+While a render job runs the images are only refilled from render_pre, right before each
+frame is rendered: frame changes in the UI (possible with Lock Interface off) would
+otherwise swap the pixels of an image the render is reading.
+"""
+import bpy
+from bpy.app.handlers import persistent
+from bpy.props import StringProperty, BoolProperty, IntProperty, FloatProperty
+from bpy.types import PropertyGroup
+
+# Settings a track can animate and the noise types that have them
+ANIMATED_SETTINGS = {
+    "seed": ("perlin", "turbulence", "spectral", "voronoii"),
+    "period": ("perlin", "turbulence", "spectral"),
+    "frequency": ("voronoii",),
+}
+
+_memory = None
+# True from render_init until the render job completes or is cancelled
+_rendering = False
+
+
+class NoiseAnimationTrack(PropertyGroup):
+    image_name: StringProperty(
+        name="Image",
+        description="Noise image regenerated on frame changes"
+    )
+    enabled: BoolProperty(
+        name="Enabled",
+        default=True,
+        description="Regenerate the image when the frame changes"
+    )
+    seed: IntProperty(
+        name="Seed",
+        default=1,
+        min=0,
+        description="Seed of the noise at the current frame"
+    )
+    period: FloatProperty(
+        name="Scale",
+        default=64.0,
+        min=0.1,
+        description="Scale of Perlin noise at the current frame"
+    )
+    frequency: FloatProperty(
+        name="Frequency",
+        default=5.0,
+        min=0.1,
+        description="Frequency of Voronoi noise at the current frame"
+    )
+
+
+def frame_params(params, values):
+    """params with the animated settings in values (name: value) that apply to its type"""
+    animated = dict(params)
+    for name, value in values.items():
+        if params["type"] in ANIMATED_SETTINGS[name]:
+            animated[name] = value
+    return animated
+
+
+def track_values(track):
+    """Current values of the animated settings of track"""
+    return {name: getattr(track, name) for name in ANIMATED_SETTINGS}
+
+
+def track_values_at(scene, index, frame):
+    """Values of the animated settings of track `index` at frame, without changing the frame"""
+    track = scene.noise_anim_tracks[index]
+    values = track_values(track)
+    action = scene.animation_data.action if scene.animation_data else None
+    if action is None:
+        return values
+    for name in values:
+        fcurve = action.fcurves.find(f"noise_anim_tracks[{index}].{name}")
+        if fcurve is None:
+            continue
+        value = fcurve.evaluate(frame)
+        if name == "seed":
+            # Blender truncates animated integer properties and clamps them to their range
+            value = max(0, int(value))
+        values[name] = value
+    return values
+
+
+def frame_cache(scene):
+    """Shared in-memory cache of animation frames, sized by the scene, backed by the disk cache when enabled"""
+    global _memory
+    from .cache import MemoryCache
+    from .noise_generators import GENERATOR_VERSION
+    from .operators import texture_cache
+
+    if _memory is None:
+        _memory = MemoryCache(0, GENERATOR_VERSION)
+    _memory.max_bytes = scene.noise_anim_cache_size * 1024 * 1024
+    _memory.backing = texture_cache(scene)
+    return _memory
+
+
+def tracked_image(track):
+    """Image of track if it exists and holds animatable noise_params, else None"""
+    img = bpy.data.images.get(track.image_name)
+    if img is None or "noise_params" not in img or img["noise_params"].get("type") not in ANIMATED_SETTINGS["seed"]:
+        return None
+    return img
+
+
+def update_images(scene):
+    """Fill every enabled tracked image with its params at the current frame"""
+    from . import procedural, recipe_undo
+    from .noise_generators import finish_image, load_or_generate
+
+    cache = None
+    for track in scene.noise_anim_tracks:
+        img = tracked_image(track) if track.enabled else None
+        if img is None:
+            continue
+        current = img["noise_params"].to_dict()
+        params = frame_params(current, track_values(track))
+        if params == current and not procedural.needs_pixels(img):
+            continue
+        cache = cache or frame_cache(scene)
+        raster = load_or_generate(params, cache, procedural.band_height_for(scene, params))
+        finish_image(img, raster, params)
+        procedural.mark_filled(img)
+        if scene.noise_recipe_undo:
+            recipe_undo.track(img)
+
+
+def remove_track(scene, index):
+    """Remove track `index` with its keyframes; keyframes of later tracks move along with them"""
+    action = scene.animation_data.action if scene.animation_data else None
+    if action is not None:
+        for fcurve in list(action.fcurves):
+            path = fcurve.data_path
+            if not path.startswith("noise_anim_tracks["):
+                continue
+            track_index = int(path[len("noise_anim_tracks["):path.index("]")])
+            if track_index == index:
+                action.fcurves.remove(fcurve)
+            elif track_index > index:
+                fcurve.data_path = f"noise_anim_tracks[{track_index - 1}]" + path[path.index("]") + 1:]
+    scene.noise_anim_tracks.remove(index)
+
+
+def _update(scene):
+    if not len(scene.noise_anim_tracks):
+        return
+    try:
+        update_images(scene)
+    except Exception as error:
+        print(f"Noise animation failed at frame {scene.frame_current}: {error}")
+
+
+@persistent
+def frame_change_pre(scene, _depsgraph=None):
+    if not _rendering:
+        _update(scene)
+
+
+@persistent
+def render_init(_scene):
+    global _rendering
+    _rendering = True
+
+
+@persistent
+def render_pre(scene):
+    _update(scene)
+
+
+@persistent
+def render_done(_scene):
+    global _rendering
+    _rendering = False
+
+
+@persistent
+def load_post(_dummy):
+    if _memory is not None:
+        _memory.clear()
+
+
+def _handlers():
+    handlers = bpy.app.handlers
+    return (
+        (handlers.frame_change_pre, frame_change_pre),
+        (handlers.render_init, render_init),
+        (handlers.render_pre, render_pre),
+        (handlers.render_complete, render_done),
+        (handlers.render_cancel, render_done),
+        (handlers.load_post, load_post),
+    )
+
+
+def register_handlers():
+    for handlers, handler in _handlers():
+        handlers.append(handler)
+
+
+def unregister_handlers():
+    global _rendering
+    _rendering = False
+    for handlers, handler in _handlers():
+        if handler in handlers:
+            handlers.remove(handler)
@@ -0,0 +1,46 @@
+"""Measure the add-on's import and registration cost.
+
+Run inside Blender from the add-on directory:
+
+    blender -b --factory-startup --python benchmarks/bench_import.py
+
+Reports the time to import the package, to register it, and the deferred cost
+paid on the first generation (importing the generators and NumPy).
+"""
+import importlib.util
+import os
+import sys
+import time
+
+ADDON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE = os.path.basename(ADDON_DIR)
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:<32} {(time.perf_counter() - start) * 1000.0:8.2f} ms")
+    return result
+
+
+def import_addon():
+    spec = importlib.util.spec_from_file_location(
+        PACKAGE, os.path.join(ADDON_DIR, "__init__.py"), submodule_search_locations=[ADDON_DIR]
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[PACKAGE] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def main():
+    numpy_preloaded = "numpy" in sys.modules
+    addon = timed("import add-on", import_addon)
+    timed("register()", addon.register)
+    print(f"{'numpy imported by add-on':<32} {('numpy' in sys.modules) and not numpy_preloaded}")
+    timed("first generator import", lambda: importlib.import_module(PACKAGE + ".noise_generators"))
+    timed("unregister()", addon.unregister)
+
+
+if __name__ == "__main__":
+    main()
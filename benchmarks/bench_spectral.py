@@ -0,0 +1,56 @@
+"""Compare spectral synthesis with lattice turbulence of increasing depth.
+
+Run inside Blender from the add-on directory:
+
+    blender -b --factory-startup --python benchmarks/bench_spectral.py
+
+Generates grayscale float rasters (no images are created) and reports the time of
+each engine per depth. Lattice turbulence grows with every octave, spectral synthesis
+costs one inverse FFT whatever the depth.
+"""
+import importlib.util
+import os
+import sys
+import time
+
+ADDON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE = os.path.basename(ADDON_DIR)
+
+SIZE = 2048
+PERIOD = 256.0
+DEPTHS = (0, 2, 4, 6)
+LACUNARITY = 2.0
+ATTEN = 0.5
+
+
+def import_generators():
+    spec = importlib.util.spec_from_file_location(
+        PACKAGE, os.path.join(ADDON_DIR, "__init__.py"), submodule_search_locations=[ADDON_DIR]
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[PACKAGE] = module
+    spec.loader.exec_module(module)
+    return importlib.import_module(PACKAGE + ".noise_generators")
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000.0
+
+
+def main():
+    generators = import_generators()
+    # Compile the numba kernels outside the measurements
+    generators.generate_raster(generators.turbulence_params(64, 64, 16.0, 1, 1, LACUNARITY, ATTEN, False, False, False, True, storage='FLOAT'))
+
+    print(f"{SIZE}x{SIZE}, scale {PERIOD}")
+    print(f"{'depth':>5} {'lattice ms':>12} {'spectral ms':>12}")
+    for depth in DEPTHS:
+        lattice = generators.turbulence_params(SIZE, SIZE, PERIOD, 1, depth, LACUNARITY, ATTEN, False, False, False, True, storage='FLOAT')
+        spectral = generators.spectral_params(SIZE, SIZE, PERIOD, 1, depth, LACUNARITY, ATTEN, False, False, False, True, storage='FLOAT')
+        print(f"{depth:>5} {timed(lambda: generators.generate_raster(lattice)):12.1f} {timed(lambda: generators.generate_raster(spectral)):12.1f}")
+
+
+if __name__ == "__main__":
+    main()
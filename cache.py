@@ -0,0 +1,148 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+import numpy as np
+
+# Parameters that only affect how an image is displayed, not its pixels
+DISPLAY_ONLY_PARAMS = ("correct_aspect",)
+
+
+def cache_key(params, version):
+    """Content hash of the pixel-affecting parameters and the generator version"""
+    recipe = {k: v for k, v in dict(params).items() if k not in DISPLAY_ONLY_PARAMS}
+    recipe["generator_version"] = version
+    blob = json.dumps(recipe, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class TextureCache:
+    """On-disk cache of generated pixel buffers keyed by a hash of their noise_params.
+
+    Entries are plain .npy files, loaded memory-mapped on a hit. The least recently
+    used entries are evicted once the directory grows past max_bytes.
+    """
+
+    def __init__(self, directory, max_bytes, version):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.version = version
+
+    def key(self, params):
+        return cache_key(params, self.version)
+
+    def path(self, params):
+        return os.path.join(self.directory, self.key(params) + ".npy")
+
+    def load(self, params):
+        """Return the cached buffer as a read-only memmap, or None on a miss"""
+        path = self.path(params)
+        try:
+            pixels = np.load(path, mmap_mode='r')
+        except (OSError, ValueError):
+            return None
+        # Mark as recently used for LRU eviction; another thread may have evicted it
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return pixels
+
+    def store(self, params, pixels):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(params)
+        # Write to a unique file next to the final one and rename, so concurrent
+        # writers don't share a temp file and readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=self.directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, np.ascontiguousarray(pixels))
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits in max_bytes"""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".npy"):
+                # Entries can disappear under us when several threads evict at once
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+    def clear(self):
+        if not os.path.isdir(self.directory):
+            return
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".npy"):
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    continue
+
+
+class MemoryCache:
+    """In-memory LRU of rasters with the same load/store interface as TextureCache.
+
+    Misses fall through to `backing` (a TextureCache or None), and everything stored
+    is passed on to it. Entries are evicted once they add up to more than max_bytes.
+    """
+
+    def __init__(self, max_bytes, version, backing=None):
+        self.max_bytes = max_bytes
+        self.version = version
+        self.backing = backing
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def load(self, params):
+        key = cache_key(params, self.version)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        raster = self.backing.load(params) if self.backing else None
+        if raster is not None:
+            self._remember(key, raster)
+        return raster
+
+    def store(self, params, raster):
+        self._remember(cache_key(params, self.version), raster)
+        if self.backing:
+            self.backing.store(params, raster)
+
+    def _remember(self, key, raster):
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key).nbytes
+            self._entries[key] = raster
+            self._bytes += raster.nbytes
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
@@ -0,0 +1,300 @@
+"""Lazy composition of noise samplers.
+
+Nodes build an expression instead of computing anything:
+
+    height = Turbulence(period=128, seed=3, depth=5)
+    warped = Warp(Perlin(period=64, seed=1), height, height, strength=24.0)
+    mask = Remap(Voronoii(frequency=8, seed=2) * warped, curve=[(0.0, 0.0), (0.4, 0.1), (1.0, 1.0)])
+    raster = bake(mask, 2048, 2048)
+
+bake() evaluates the expression tile by tile. Inside a tile every node is computed once
+per coordinate set, so subexpressions shared by several parents (like `height` above)
+are not recomputed, and no intermediate ever spans the whole image.
+
+Coordinates are in pixels. Samplers keep the tiling behavior of the generators:
+Perlin and turbulence wrap every `period` pixels, Voronoii every image width/height.
+"""
+import json
+import math
+import numpy as np
+from .noise_samplers import PerlinSampler2D, VoronoiiSampler2D
+
+
+class _Coords:
+    """Pixel coordinates of one tile, possibly displaced by a Warp"""
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+class NoiseNode:
+    """Base class of the lazy expression graph"""
+    kind = None
+
+    def __add__(self, other):
+        return Add(self, as_node(other))
+
+    def __radd__(self, other):
+        return Add(as_node(other), self)
+
+    def __mul__(self, other):
+        return Multiply(self, as_node(other))
+
+    def __rmul__(self, other):
+        return Multiply(as_node(other), self)
+
+    def __abs__(self):
+        return Abs(self)
+
+    def inputs(self):
+        return ()
+
+    def evaluate(self, coords, context, memo):
+        """Value of the node at coords, computed at most once per (node, coords)"""
+        key = (self, coords)
+        if key not in memo:
+            memo[key] = self.compute(coords, context, memo)
+        return memo[key]
+
+    def compute(self, coords, context, memo):
+        raise NotImplementedError
+
+    def settings(self):
+        return {}
+
+    def to_recipe(self):
+        """JSON-compatible description of the expression rooted at this node"""
+        recipe = {"node": self.kind}
+        recipe.update(self.settings())
+        if self.inputs():
+            recipe["inputs"] = [node.to_recipe() for node in self.inputs()]
+        return recipe
+
+
+def as_node(value):
+    return value if isinstance(value, NoiseNode) else Constant(value)
+
+
+class Constant(NoiseNode):
+    kind = "constant"
+
+    def __init__(self, value):
+        self.value = float(value)
+
+    def compute(self, coords, context, memo):
+        return np.full(coords.x.shape, self.value)
+
+    def settings(self):
+        return {"value": self.value}
+
+
+class Perlin(NoiseNode):
+    """Signed Perlin noise, roughly in [-0.7, 0.7]"""
+    kind = "perlin"
+
+    def __init__(self, period=64.0, seed=1):
+        self.period = float(period)
+        self.seed = int(seed)
+
+    def compute(self, coords, context, memo):
+        sampler = context.sampler(self, lambda: PerlinSampler2D(
+            math.ceil(context.width / self.period), math.ceil(context.height / self.period), self.seed))
+        return sampler.get_value_vectorized(coords.x / self.period, coords.y / self.period)
+
+    def settings(self):
+        return {"period": self.period, "seed": self.seed}
+
+
+class Turbulence(NoiseNode):
+    """Signed multi-octave Perlin noise normalized by the amplitude sum"""
+    kind = "turbulence"
+
+    def __init__(self, period=64.0, seed=1, depth=4, lacunarity=2.0, atten=0.5):
+        self.period = float(period)
+        self.seed = int(seed)
+        self.depth = int(depth)
+        self.lacunarity = float(lacunarity)
+        self.atten = float(atten)
+
+    def _octaves(self, context):
+        octaves = []
+        for lvl in range(self.depth + 1):
+            local_period = self.period / self.lacunarity ** lvl
+            sampler = PerlinSampler2D(
+                math.ceil(context.width / local_period), math.ceil(context.height / local_period),
+                self.seed + lvl * 10000  # Same seeds as the turbulence generator's first channel
+            )
+            octaves.append((local_period, (1.0 / self.lacunarity ** lvl) ** self.atten, sampler))
+        return octaves
+
+    def compute(self, coords, context, memo):
+        octaves = context.sampler(self, lambda: self._octaves(context))
+        value = np.zeros(coords.x.shape)
+        for local_period, amplitude, sampler in octaves:
+            value += sampler.get_value_vectorized(coords.x / local_period, coords.y / local_period) * amplitude
+        return value / sum(amplitude for _, amplitude, _ in octaves)
+
+    def settings(self):
+        return {"period": self.period, "seed": self.seed, "depth": self.depth,
+                "lacunarity": self.lacunarity, "atten": self.atten}
+
+
+class Voronoii(NoiseNode):
+    """Voronoii distance noise in cell units (see VoronoiiSampler2D.get_value_vectorized)"""
+    kind = "voronoii"
+
+    def __init__(self, frequency=4.0, seed=1, return_type=0, randomness=1.0, minkowski_exponent=3.0):
+        self.frequency = float(frequency)
+        self.seed = int(seed)
+        self.return_type = int(return_type)
+        self.randomness = float(randomness)
+        self.minkowski_exponent = float(minkowski_exponent)
+
+    def compute(self, coords, context, memo):
+        sampler = context.sampler(self, lambda: VoronoiiSampler2D(
+            math.ceil(self.frequency), math.ceil(self.frequency), self.seed, randomness=self.randomness))
+        return sampler.get_value_vectorized(
+            coords.x / context.width, coords.y / context.height, self.frequency, self.return_type,
+            minkowski_exponent=self.minkowski_exponent
+        )
+
+    def settings(self):
+        return {"frequency": self.frequency, "seed": self.seed, "return_type": self.return_type,
+                "randomness": self.randomness, "minkowski_exponent": self.minkowski_exponent}
+
+
+class Add(NoiseNode):
+    kind = "add"
+
+    def __init__(self, a, b):
+        self.a = as_node(a)
+        self.b = as_node(b)
+
+    def inputs(self):
+        return (self.a, self.b)
+
+    def compute(self, coords, context, memo):
+        return self.a.evaluate(coords, context, memo) + self.b.evaluate(coords, context, memo)
+
+
+class Multiply(NoiseNode):
+    kind = "multiply"
+
+    def __init__(self, a, b):
+        self.a = as_node(a)
+        self.b = as_node(b)
+
+    def inputs(self):
+        return (self.a, self.b)
+
+    def compute(self, coords, context, memo):
+        return self.a.evaluate(coords, context, memo) * self.b.evaluate(coords, context, memo)
+
+
+class Abs(NoiseNode):
+    kind = "abs"
+
+    def __init__(self, source):
+        self.source = as_node(source)
+
+    def inputs(self):
+        return (self.source,)
+
+    def compute(self, coords, context, memo):
+        return np.abs(self.source.evaluate(coords, context, memo))
+
+
+class Warp(NoiseNode):
+    """Evaluate source at coordinates displaced by offset_x/offset_y (times strength, in pixels)"""
+    kind = "warp"
+
+    def __init__(self, source, offset_x, offset_y, strength=16.0):
+        self.source = as_node(source)
+        self.offset_x = as_node(offset_x)
+        self.offset_y = as_node(offset_y)
+        self.strength = float(strength)
+
+    def inputs(self):
+        return (self.source, self.offset_x, self.offset_y)
+
+    def compute(self, coords, context, memo):
+        warped = _Coords(
+            coords.x + self.strength * self.offset_x.evaluate(coords, context, memo),
+            coords.y + self.strength * self.offset_y.evaluate(coords, context, memo)
+        )
+        return self.source.evaluate(warped, context, memo)
+
+    def settings(self):
+        return {"strength": self.strength}
+
+
+class Remap(NoiseNode):
+    """Map source from in_range to out_range, optionally through a piecewise linear curve.
+
+    curve is a list of (x, y) points in 0-1, applied between the two linear maps.
+    """
+    kind = "remap"
+
+    def __init__(self, source, in_range=(0.0, 1.0), out_range=(0.0, 1.0), curve=None):
+        self.source = as_node(source)
+        self.in_range = tuple(float(v) for v in in_range)
+        self.out_range = tuple(float(v) for v in out_range)
+        self.curve = [tuple(float(v) for v in point) for point in curve] if curve else None
+
+    def inputs(self):
+        return (self.source,)
+
+    def compute(self, coords, context, memo):
+        value = self.source.evaluate(coords, context, memo)
+        in_min, in_max = self.in_range
+        t = (value - in_min) / (in_max - in_min) if in_max != in_min else np.zeros_like(value)
+        if self.curve:
+            t = np.interp(t, [p[0] for p in self.curve], [p[1] for p in self.curve])
+        out_min, out_max = self.out_range
+        return out_min + t * (out_max - out_min)
+
+    def settings(self):
+        return {"in_range": list(self.in_range), "out_range": list(self.out_range),
+                "curve": [list(p) for p in self.curve] if self.curve else None}
+
+
+NODE_TYPES = {cls.kind: cls for cls in (Constant, Perlin, Turbulence, Voronoii, Add, Multiply, Abs, Warp, Remap)}
+
+
+def from_recipe(recipe, _built=None):
+    """Rebuild an expression from to_recipe() output, sharing identical subexpressions"""
+    if isinstance(recipe, str):
+        recipe = json.loads(recipe)
+    _built = {} if _built is None else _built
+    key = json.dumps(recipe, sort_keys=True)
+    if key not in _built:
+        settings = {k: v for k, v in recipe.items() if k not in ("node", "inputs")}
+        inputs = [from_recipe(child, _built) for child in recipe.get("inputs", [])]
+        _built[key] = NODE_TYPES[recipe["node"]](*inputs, **settings)
+    return _built[key]
+
+
+class BakeContext:
+    """Image size and the samplers of every node, created once per bake"""
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self._samplers = {}
+
+    def sampler(self, node, factory):
+        if node not in self._samplers:
+            self._samplers[node] = factory()
+        return self._samplers[node]
+
+
+def bake(root, width, height, tile_size=256, out=None):
+    """Evaluate the expression over a width x height image, one tile at a time"""
+    context = BakeContext(width, height)
+    out = np.empty((height, width), dtype=np.float32) if out is None else out
+    for top in range(0, height, tile_size):
+        for left in range(0, width, tile_size):
+            bottom = min(top + tile_size, height)
+            right = min(left + tile_size, width)
+            x, y = np.meshgrid(np.arange(left, right, dtype=np.float64), np.arange(top, bottom, dtype=np.float64))
+            out[top:bottom, left:right] = root.evaluate(_Coords(x, y), context, {})
+    return out
@@ -0,0 +1,263 @@
+"""Write generated textures to disk without going through Blender images.
+
+Encoders take a (height, width, channels) raster laid out like Blender's (bottom row
+first) and write it top row first, the way the image is displayed. One channel is
+written as gray, two as gray and alpha, three as RGB and four as RGBA; byte rasters
+are read as 0-255, everything else as 0-1 floats. They only use NumPy,
+zlib and struct, so they are safe to run in worker threads; zlib and NumPy release
+the GIL for the heavy parts, so several exports really run in parallel.
+"""
+import os
+import struct
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+
+# Channel names by channel count
+CHANNEL_NAMES = {1: "Y", 2: "YA", 3: "RGB", 4: "RGBA"}
+# PNG color type by channel count: gray, gray + alpha, RGB, RGBA
+PNG_COLOR_TYPES = {1: 0, 2: 4, 3: 2, 4: 6}
+
+
+def _rows_top_down(pixels):
+    pixels = np.asarray(pixels)
+    if pixels.ndim == 2:
+        pixels = pixels[..., np.newaxis]
+    return pixels[::-1]
+
+
+def _as_float(band):
+    """0-1 float32 values of a band of rows"""
+    if band.dtype == np.uint8:
+        return band.astype(np.float32) * np.float32(1.0 / 255.0)
+    return band.astype(np.float32, copy=False)
+
+
+def write_exr_half(path, pixels, band_height=256):
+    """Uncompressed scanline OpenEXR with a half float channel per raster channel"""
+    rows = _rows_top_down(pixels)
+    height, width, num_channels = rows.shape
+    names = CHANNEL_NAMES[num_channels]
+    # Channels must be stored in alphabetical order
+    order = sorted(range(num_channels), key=lambda k: names[k])
+
+    def attribute(name, type_name, data):
+        return name.encode() + b"\0" + type_name.encode() + b"\0" + struct.pack("<i", len(data)) + data
+
+    # Channels must be listed alphabetically, pixel type 1 = HALF
+    channels = b"".join(names[k].encode() + b"\0" + struct.pack("<iB3xii", 1, 0, 1, 1) for k in order) + b"\0"
+    window = struct.pack("<iiii", 0, 0, width - 1, height - 1)
+    header = (
+        struct.pack("<ii", 20000630, 2)
+        + attribute("channels", "chlist", channels)
+        + attribute("compression", "compression", b"\0")
+        + attribute("dataWindow", "box2i", window)
+        + attribute("displayWindow", "box2i", window)
+        + attribute("lineOrder", "lineOrder", b"\0")
+        + attribute("pixelAspectRatio", "float", struct.pack("<f", 1.0))
+        + attribute("screenWindowCenter", "v2f", struct.pack("<ff", 0.0, 0.0))
+        + attribute("screenWindowWidth", "float", struct.pack("<f", 1.0))
+        + b"\0"
+    )
+
+    # One scanline per block: y, byte count, then a run of `width` halves per channel
+    line_bytes = width * num_channels * 2
+    block_size = 8 + line_bytes
+    first_block = len(header) + 8 * height
+    offsets = first_block + block_size * np.arange(height, dtype="<u8")
+
+    with open(path, "wb") as f:
+        f.write(header)
+        f.write(offsets.tobytes())
+        for start in range(0, height, band_height):
+            band = rows[start:start + band_height]
+            # (rows, channel, width) halves
+            planar = np.ascontiguousarray(_as_float(band[..., order]).transpose(0, 2, 1), dtype="<f2")
+            blocks = np.empty((len(band), block_size), dtype=np.uint8)
+            blocks[:, :4] = np.arange(start, start + len(band), dtype="<i4").view(np.uint8).reshape(-1, 4)
+            blocks[:, 4:8] = np.frombuffer(struct.pack("<i", line_bytes), dtype=np.uint8)
+            blocks[:, 8:] = planar.view(np.uint8).reshape(len(band), line_bytes)
+            f.write(blocks.tobytes())
+
+
+def write_png16(path, pixels, compress_level=6, band_height=256):
+    """16 bit gray, gray + alpha, RGB or RGBA PNG, compressed and written a band at a time"""
+    rows = _rows_top_down(pixels)
+    height, width, num_channels = rows.shape
+
+    def chunk(tag, data):
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+    compressor = zlib.compressobj(compress_level)
+    with open(path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        f.write(chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 16, PNG_COLOR_TYPES[num_channels], 0, 0, 0)))
+        for start in range(0, height, band_height):
+            band = rows[start:start + band_height]
+            # Every scanline starts with filter type 0
+            scanlines = np.zeros((len(band), 1 + width * num_channels * 2), dtype=np.uint8)
+            if band.dtype == np.uint8:
+                # 255 * 257 = 65535, exact
+                values = (band.astype(np.uint16) * 257).astype(">u2")
+            else:
+                # Half floats overflow at 65535, scale in single precision
+                values = (np.clip(_as_float(band), 0.0, 1.0) * 65535.0 + 0.5).astype(">u2")
+            scanlines[:, 1:] = values.reshape(len(band), -1).view(np.uint8)
+            # The image data may be split over any number of IDAT chunks
+            data = compressor.compress(scanlines.tobytes())
+            if data:
+                f.write(chunk(b"IDAT", data))
+        f.write(chunk(b"IDAT", compressor.flush()))
+        f.write(chunk(b"IEND", b""))
+
+
+def write_raw(path, pixels, band_height=256):
+    """Headerless little endian float32, channels interleaved, top row first"""
+    rows = _rows_top_down(pixels)
+    with open(path, "wb") as f:
+        for start in range(0, rows.shape[0], band_height):
+            f.write(np.ascontiguousarray(_as_float(rows[start:start + band_height]), dtype="<f4").tobytes())
+
+
+# format: (file extension, encoder)
+EXPORT_FORMATS = {
+    'EXR': (".exr", write_exr_half),
+    'PNG16': (".png", write_png16),
+    'RAW': (".raw", write_raw),
+}
+
+
+def write_tiles(path, pixels, fmt, tile_size):
+    """Write pixels as tile_size x tile_size files named <path>_<row>_<column>, row 0 at the top.
+
+    Returns the paths written. Tiles are views of pixels, so a memmap is read one tile at a time.
+    """
+    extension, encoder = EXPORT_FORMATS[fmt]
+    stem = path[:-len(extension)] if path.lower().endswith(extension) else path
+    height, width = pixels.shape[:2]
+    paths = []
+    for row, top in enumerate(range(0, height, tile_size)):
+        # Rasters are stored bottom row first
+        bottom, upper = max(0, height - top - tile_size), height - top
+        for column, left in enumerate(range(0, width, tile_size)):
+            tile_path = f"{stem}_{row}_{column}{extension}"
+            encoder(tile_path, pixels[bottom:upper, left:left + tile_size])
+            paths.append(tile_path)
+    return paths
+
+
+class ExportJob:
+    def __init__(self, path, fmt, pixels=None, params=None, npy_path=None, band_height=None, tile_size=0, keep_npy=True):
+        self.path = path
+        self.fmt = fmt
+        self.pixels = pixels
+        self.params = params
+        # Out of core: params are generated into this .npy file instead of memory
+        self.npy_path = npy_path
+        self.band_height = band_height
+        self.tile_size = tile_size
+        self.keep_npy = keep_npy
+        self.status = 'PENDING'
+        self.error = None
+        self.bytes_written = 0
+        self.seconds = 0.0
+
+
+class ExportQueue:
+    """Encodes and writes textures in a pool of worker threads.
+
+    Jobs carry either a finished pixel buffer or a noise_params dict, which the worker
+    generates first (as a compact raster, so grayscale noise is written with one
+    channel), in memory or into a memory-mapped .npy (see out_of_core.py). Nothing here
+    touches bpy, so callers can poll from a timer.
+    """
+
+    def __init__(self, workers=4):
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="noise_export")
+        self._lock = threading.Lock()
+        self.jobs = []
+        self._started = None
+
+    def submit(self, path, fmt, pixels=None, params=None, npy_path=None, band_height=None, tile_size=0, keep_npy=True):
+        extension, _ = EXPORT_FORMATS[fmt]
+        if not path.lower().endswith(extension):
+            path += extension
+        if params is not None:
+            from . import jit_kernels
+            jit_kernels.warm_up()
+        job = ExportJob(path, fmt, pixels, params, npy_path, band_height, tile_size, keep_npy)
+        with self._lock:
+            if self._started is None or self.idle():
+                self._started = time.perf_counter()
+            self.jobs.append(job)
+        self._executor.submit(self._run, job)
+        return job
+
+    def _run(self, job):
+        job.status = 'RUNNING'
+        start = time.perf_counter()
+        try:
+            pixels = job.pixels
+            if pixels is None and job.npy_path:
+                from .out_of_core import generate_to_file
+                pixels = generate_to_file(job.params, job.npy_path, job.band_height)
+            elif pixels is None:
+                from .noise_generators import generate_raster
+                pixels = generate_raster(job.params, job.band_height)
+            os.makedirs(os.path.dirname(job.path) or ".", exist_ok=True)
+            if job.tile_size:
+                paths = write_tiles(job.path, pixels, job.fmt, job.tile_size)
+            else:
+                EXPORT_FORMATS[job.fmt][1](job.path, pixels)
+                paths = [job.path]
+            job.bytes_written = sum(os.path.getsize(path) for path in paths)
+            if job.npy_path and not job.keep_npy:
+                # Close the memmap first, open files can't be removed on Windows
+                del pixels
+                os.remove(job.npy_path)
+            job.status = 'DONE'
+        except Exception as error:
+            job.error = str(error)
+            job.status = 'FAILED'
+        finally:
+            # Drop the buffer as soon as it is written
+            job.pixels = None
+            job.seconds = time.perf_counter() - start
+
+    def idle(self):
+        return all(job.status in ('DONE', 'FAILED') for job in self.jobs)
+
+    def summary(self):
+        """(finished, total, failed, megabytes per second since the batch started)"""
+        with self._lock:
+            jobs = list(self.jobs)
+        finished = [job for job in jobs if job.status in ('DONE', 'FAILED')]
+        failed = sum(1 for job in finished if job.status == 'FAILED')
+        elapsed = time.perf_counter() - self._started if self._started else 0.0
+        written = sum(job.bytes_written for job in finished)
+        throughput = written / (1024 * 1024) / elapsed if elapsed > 0 else 0.0
+        return len(finished), len(jobs), failed, throughput
+
+    def clear_finished(self):
+        with self._lock:
+            self.jobs = [job for job in self.jobs if job.status not in ('DONE', 'FAILED')]
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_queue = None
+
+
+def get_export_queue(workers=4):
+    """Shared queue, recreated when the worker count changes and it is idle"""
+    global _queue
+    if _queue is None or (_queue.workers != workers and _queue.idle()):
+        if _queue is not None:
+            _queue.shutdown()
+        _queue = ExportQueue(workers)
+    return _queue
@@ -0,0 +1,264 @@
+"""Optional Numba-compiled kernels for the noise samplers.
+
+Each kernel walks the image once and computes every pixel in registers instead of
+allocating a full-size temporary per NumPy operation. The arithmetic mirrors the
+NumPy path in noise_samplers step by step, so both backends give the same values.
+When numba is not importable HAS_NUMBA is False and the samplers keep using NumPy.
+"""
+import math
+import threading
+import numpy as np
+
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+# Set to False to force the NumPy path even when numba is available
+ENABLED = HAS_NUMBA
+
+# Metric codes understood by voronoi_features
+METRIC_EUCLIDEAN = 0  # compared squared
+METRIC_MANHATTAN = 1
+METRIC_CHEBYSHEV = 2
+METRIC_INTEGER = 3    # compared in p-th power space, integer p
+METRIC_POWER = 4      # compared in p-th power space, any p
+
+
+def enabled():
+    return HAS_NUMBA and ENABLED
+
+
+# Parallel kernels are launched one at a time: the workqueue threading layer is not thread
+# safe, and a single launch already keeps every core busy
+_launch_lock = threading.Lock()
+_warmed_up = False
+
+
+def _serialized(kernel):
+    def launch(*args):
+        with _launch_lock:
+            return kernel(*args)
+    launch.__doc__ = kernel.__doc__
+    return launch
+
+
+def warm_up():
+    """Start Numba's threading layer from the calling thread.
+
+    Call on the main thread before kernels run in worker threads: a TBB threading layer
+    first started from a worker thread can hang the interpreter at exit.
+    """
+    global _warmed_up
+    if _warmed_up or not enabled():
+        return
+    _warmed_up = True
+    # Same argument types as the Perlin generators, so no extra specialization is compiled
+    perlin_accumulate_channels(np.zeros((1, 1, 1), dtype=np.float32), 1.0, np.zeros((1, 4, 2), dtype=np.float32), 2, 2, 0.0, 0)
+
+
+if HAS_NUMBA:
+    @njit(cache=True, inline='always')
+    def _perlin(x, y, gradients, grid_w, grid_h):
+        x_floor = math.floor(x)
+        y_floor = math.floor(y)
+        x_frac = x - x_floor
+        y_frac = y - y_floor
+
+        x0 = int(x_floor) % grid_w
+        y0 = int(y_floor) % grid_h
+        x1 = (x0 + 1) % grid_w
+        y1 = (y0 + 1) % grid_h
+
+        o00 = x0 + y0 * grid_w
+        o10 = x1 + y0 * grid_w
+        o01 = x0 + y1 * grid_w
+        o11 = x1 + y1 * grid_w
+        v00 = gradients[o00, 0] * x_frac + gradients[o00, 1] * y_frac
+        v10 = gradients[o10, 0] * (x_frac - 1) + gradients[o10, 1] * y_frac
+        v01 = gradients[o01, 0] * x_frac + gradients[o01, 1] * (y_frac - 1)
+        v11 = gradients[o11, 0] * (x_frac - 1) + gradients[o11, 1] * (y_frac - 1)
+
+        sx = x_frac * x_frac * (3 - 2 * x_frac)
+        sy = y_frac * y_frac * (3 - 2 * y_frac)
+        a = v00 + sx * (v10 - v00)
+        b = v01 + sx * (v11 - v01)
+        return a + sy * (b - a)
+
+    @njit(cache=True, inline='always')
+    def _perlin_derivatives(x, y, gradients, grid_w, grid_h):
+        """(value, d/dx, d/dy) of _perlin, same steps as PerlinSampler2D._value_and_derivatives"""
+        x_floor = math.floor(x)
+        y_floor = math.floor(y)
+        x_frac = x - x_floor
+        y_frac = y - y_floor
+
+        x0 = int(x_floor) % grid_w
+        y0 = int(y_floor) % grid_h
+        x1 = (x0 + 1) % grid_w
+        y1 = (y0 + 1) % grid_h
+
+        o00 = x0 + y0 * grid_w
+        o10 = x1 + y0 * grid_w
+        o01 = x0 + y1 * grid_w
+        o11 = x1 + y1 * grid_w
+        v00 = gradients[o00, 0] * x_frac + gradients[o00, 1] * y_frac
+        v10 = gradients[o10, 0] * (x_frac - 1) + gradients[o10, 1] * y_frac
+        v01 = gradients[o01, 0] * x_frac + gradients[o01, 1] * (y_frac - 1)
+        v11 = gradients[o11, 0] * (x_frac - 1) + gradients[o11, 1] * (y_frac - 1)
+
+        sx = x_frac * x_frac * (3 - 2 * x_frac)
+        sy = y_frac * y_frac * (3 - 2 * y_frac)
+        dsx = 6 * x_frac * (1 - x_frac)
+        dsy = 6 * y_frac * (1 - y_frac)
+        a = v00 + sx * (v10 - v00)
+        b = v01 + sx * (v11 - v01)
+        da_dx = gradients[o00, 0] + sx * (gradients[o10, 0] - gradients[o00, 0]) + dsx * (v10 - v00)
+        db_dx = gradients[o01, 0] + sx * (gradients[o11, 0] - gradients[o01, 0]) + dsx * (v11 - v01)
+        da_dy = gradients[o00, 1] + sx * (gradients[o10, 1] - gradients[o00, 1])
+        db_dy = gradients[o01, 1] + sx * (gradients[o11, 1] - gradients[o01, 1])
+        return a + sy * (b - a), da_dx + sy * (db_dx - da_dx), da_dy + sy * (db_dy - da_dy) + dsy * (b - a)
+
+    @njit(parallel=True, cache=True)
+    def perlin_values(x_coords, y_coords, gradients, grid_w, grid_h):
+        """Perlin noise at arbitrary 2D coordinate arrays"""
+        height, width = x_coords.shape
+        out = np.empty((height, width))
+        for i in prange(height):
+            for j in range(width):
+                out[i, j] = _perlin(x_coords[i, j], y_coords[i, j], gradients, grid_w, grid_h)
+        return out
+
+    @njit(parallel=True, cache=True)
+    def perlin_accumulate_channels(out, period, gradients, grid_w, grid_h, amplitude, row_offset):
+        """out[i, j, k] += amplitude * perlin_k(j / period, (i + row_offset) / period), gradients stacked (channels, cells, 2).
+
+        Coordinates are generated in the loop, so a whole turbulence octave needs no temporaries.
+        The lattice cell and interpolation weights are shared, only the dot products differ.
+        """
+        height, width, channels = out.shape
+        for i in prange(height):
+            y = (i + row_offset) / period
+            y_floor = math.floor(y)
+            y_frac = y - y_floor
+            y0 = int(y_floor) % grid_h
+            y1 = (y0 + 1) % grid_h
+            sy = y_frac * y_frac * (3 - 2 * y_frac)
+            for j in range(width):
+                x = j / period
+                x_floor = math.floor(x)
+                x_frac = x - x_floor
+                x0 = int(x_floor) % grid_w
+                x1 = (x0 + 1) % grid_w
+                sx = x_frac * x_frac * (3 - 2 * x_frac)
+
+                o00 = x0 + y0 * grid_w
+                o10 = x1 + y0 * grid_w
+                o01 = x0 + y1 * grid_w
+                o11 = x1 + y1 * grid_w
+                for k in range(channels):
+                    v00 = gradients[k, o00, 0] * x_frac + gradients[k, o00, 1] * y_frac
+                    v10 = gradients[k, o10, 0] * (x_frac - 1) + gradients[k, o10, 1] * y_frac
+                    v01 = gradients[k, o01, 0] * x_frac + gradients[k, o01, 1] * (y_frac - 1)
+                    v11 = gradients[k, o11, 0] * (x_frac - 1) + gradients[k, o11, 1] * (y_frac - 1)
+                    a = v00 + sx * (v10 - v00)
+                    b = v01 + sx * (v11 - v01)
+                    out[i, j, k] += (a + sy * (b - a)) * amplitude
+
+    @njit(parallel=True, cache=True)
+    def perlin_accumulate_derivatives(value, d_dx, d_dy, period, gradients, grid_w, grid_h, amplitude, slope_scale, row_offset):
+        """Single channel Perlin accumulation (see perlin_accumulate_channels) that also adds the derivatives, times amplitude * slope_scale, to d_dx and d_dy"""
+        height, width = value.shape
+        for i in prange(height):
+            y = (i + row_offset) / period
+            for j in range(width):
+                v, dx, dy = _perlin_derivatives(j / period, y, gradients, grid_w, grid_h)
+                value[i, j] += v * amplitude
+                d_dx[i, j] += dx * amplitude * slope_scale
+                d_dy[i, j] += dy * amplitude * slope_scale
+
+    @njit(cache=True, inline='always')
+    def _int_power(value, exponent):
+        # Same multiplication order as VoronoiiSampler2D._int_power
+        result = 1.0
+        first = True
+        while exponent:
+            if exponent & 1:
+                if first:
+                    result = value
+                    first = False
+                else:
+                    result = result * value
+            exponent >>= 1
+            if exponent:
+                value = value * value
+        return result
+
+    @njit(cache=True, inline='always')
+    def _compare(dx, dy, metric, exponent):
+        if metric == 0:
+            return dx * dx + dy * dy
+        if metric == 1:
+            return abs(dx) + abs(dy)
+        if metric == 2:
+            return max(abs(dx), abs(dy))
+        if metric == 3:
+            return _int_power(abs(dx), int(exponent)) + _int_power(abs(dy), int(exponent))
+        return abs(dx) ** exponent + abs(dy) ** exponent
+
+    @njit(parallel=True, cache=True)
+    def voronoi_features(x_coords, y_coords, points, block_size, grid_x, grid_y, metric, exponent, with_edge):
+        """F1, F2 (in comparison space) and the cell id of F1 for every pixel in one pass.
+
+        With with_edge, also the Euclidean distance to the bisector of the F1 and F2 points
+        (else an empty array).
+        """
+        height, width = x_coords.shape
+        f1 = np.empty((height, width))
+        f2 = np.empty((height, width))
+        cell_ids = np.empty((height, width), dtype=np.int64)
+        edge = np.empty((height, width) if with_edge else (0, 0))
+        block_size32 = np.float32(block_size)
+        for i in prange(height):
+            for j in range(width):
+                x = x_coords[i, j]
+                y = y_coords[i, j]
+                block_x = int(math.floor(x / block_size))
+                block_y = int(math.floor(y / block_size))
+                best0 = np.inf
+                best1 = np.inf
+                best_id = 0
+                # Pixel - point vectors of F1 and F2
+                ax = ay = bx = by = 0.0
+                for ox in range(-1, 2):
+                    neighbor_x = block_x + ox
+                    cell_x = neighbor_x % grid_x
+                    for oy in range(-1, 2):
+                        neighbor_y = block_y + oy
+                        cell_y = neighbor_y % grid_y
+                        px = points[cell_y, cell_x, 0] * block_size32
+                        py = points[cell_y, cell_x, 1] * block_size32
+                        dx = x - (neighbor_x * block_size + px)
+                        dy = y - (neighbor_y * block_size + py)
+                        d = _compare(dx, dy, metric, exponent)
+                        if d < best0:
+                            best1 = best0
+                            best0 = d
+                            best_id = cell_y * grid_x + cell_x
+                            bx, by = ax, ay
+                            ax, ay = dx, dy
+                        elif d < best1:
+                            best1 = d
+                            bx, by = dx, dy
+                f1[i, j] = best0
+                f2[i, j] = best1
+                cell_ids[i, j] = best_id
+                if with_edge:
+                    edge[i, j] = abs(bx * bx + by * by - ax * ax - ay * ay) / (2.0 * math.sqrt((bx - ax) ** 2 + (by - ay) ** 2))
+        return f1, f2, cell_ids, edge
+
+    perlin_values = _serialized(perlin_values)
+    perlin_accumulate_channels = _serialized(perlin_accumulate_channels)
+    perlin_accumulate_derivatives = _serialized(perlin_accumulate_derivatives)
+    voronoi_features = _serialized(voronoi_features)
@@ -0,0 +1,141 @@
+"""Background generation jobs.
+
+Jobs generate compact rasters in a pool of worker threads. A main-thread timer hands
+the results to each job's apply callback in submission order, so images are updated
+in the order they were queued even when a later job finishes first.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+import bpy
+
+# Finished jobs kept for the panel list
+MAX_FINISHED = 20
+
+
+class Job:
+    def __init__(self, label, params, apply, cache=None, band_height=None, on_failure=None):
+        self.label = label
+        self.params = params
+        self.apply = apply
+        self.on_failure = on_failure
+        self.cache = cache
+        self.band_height = band_height
+        self.status = 'PENDING'
+        self.error = None
+        self.future = None
+        self.queued = time.perf_counter()
+        self.started = None
+        self.finished = None
+
+    def seconds(self):
+        """Generation time so far (or in total once finished)"""
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.perf_counter()) - self.started
+
+
+class JobQueue:
+    """Runs generation jobs in `workers` threads and applies their results on the main thread"""
+
+    def __init__(self, workers=2):
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="noise_job")
+        self.jobs = []
+
+    def submit(self, label, params, apply, cache=None, band_height=None, on_failure=None):
+        """Queue the generation of params; apply(raster) is called on the main thread when it is done.
+
+        If generating or applying fails, on_failure(error) is called instead (also on the main thread).
+        """
+        from . import jit_kernels
+
+        jit_kernels.warm_up()
+        job = Job(label, params, apply, cache, band_height, on_failure)
+        self.jobs.append(job)
+        job.future = self._executor.submit(self._run, job)
+        if not bpy.app.timers.is_registered(_apply_finished):
+            bpy.app.timers.register(_apply_finished, first_interval=0.1)
+        return job
+
+    def _run(self, job):
+        from .noise_generators import load_or_generate
+
+        job.status = 'RUNNING'
+        job.started = time.perf_counter()
+        try:
+            return load_or_generate(job.params, job.cache, job.band_height)
+        finally:
+            job.finished = time.perf_counter()
+            job.status = 'READY'
+
+    def _apply(self, job):
+        try:
+            job.apply(job.future.result())
+            job.status = 'DONE'
+        except Exception as error:
+            job.error = str(error)
+            job.status = 'FAILED'
+            print(f"Noise job {job.label} failed: {error}")
+            if job.on_failure is not None:
+                job.on_failure(error)
+
+    def apply_finished(self):
+        """Apply finished jobs in submission order, stopping at the first one still running"""
+        for job in self.jobs:
+            if job.status in ('DONE', 'FAILED'):
+                continue
+            if not job.future.done():
+                break
+            self._apply(job)
+        self._forget_old()
+
+    def apply_now(self, job):
+        """Wait for job and apply it immediately, out of order"""
+        if job.status not in ('DONE', 'FAILED'):
+            # Waits without raising, _apply() reports a failure
+            job.future.exception()
+            self._apply(job)
+
+    def _forget_old(self):
+        finished = [job for job in self.jobs if job.status in ('DONE', 'FAILED')]
+        for job in finished[:max(0, len(finished) - MAX_FINISHED)]:
+            self.jobs.remove(job)
+
+    def busy(self):
+        return any(job.status not in ('DONE', 'FAILED') for job in self.jobs)
+
+    def clear_finished(self):
+        self.jobs = [job for job in self.jobs if job.status not in ('DONE', 'FAILED')]
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_queue = None
+
+
+def current_queue():
+    """The shared queue if one was created, without creating it"""
+    return _queue
+
+
+def get_job_queue(workers=2):
+    """Shared queue, recreated when the worker count changes and it is idle"""
+    global _queue
+    if _queue is None or (_queue.workers != workers and not _queue.busy()):
+        if _queue is not None:
+            _queue.shutdown()
+        _queue = JobQueue(workers)
+    return _queue
+
+
+def _apply_finished():
+    """Timer: apply finished jobs and keep the job list in the panel up to date"""
+    if _queue is None:
+        return None
+    _queue.apply_finished()
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'IMAGE_EDITOR':
+                area.tag_redraw()
+    return 0.1 if _queue.busy() else None
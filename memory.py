@@ -0,0 +1,214 @@
+"""Peak memory estimates for the generators, used to size row bands before generating.
+
+The numbers are per-pixel byte counts of the arrays each generator keeps alive at its
+peak, rounded up from tracemalloc measurements of the NumPy path. Whole-image buffers are
+paid once, band temporaries scale with the number of rows evaluated at a time (see
+noise_generators.row_bands), and the noise lattices scale with their number of cells.
+"""
+import math
+
+# Smallest band worth evaluating, below this the per-band overhead dominates
+MIN_BAND_ROWS = 8
+
+# Blender's own image buffer per storage format (always RGBA)
+IMAGE_BUFFER_BYTES = {
+    'BYTE': 4,
+    'HALF': 8,
+    'FLOAT': 16,
+}
+# Bytes per channel of the compact raster kept for each storage format
+RASTER_CHANNEL_BYTES = {
+    'BYTE': 1,
+    'HALF': 2,
+    'FLOAT': 4,
+}
+# RGBA float32 buffer handed to Image.pixels.foreach_set
+PIXELS_BYTES = 16
+
+# Temporaries per pixel of a band: coordinates, lattice indices, dot products, weights,
+# and the stacked float64 values of up to 4 channels times the amplitude
+PERLIN_BAND_BYTES = 264
+PERLIN_BAND_BYTES_JIT = 0
+# Lattices too large for a table (HASHED) hash their gradients per pixel, also with Numba
+PERLIN_HASH_BAND_BYTES = 288
+# Pixel engine: 9 distances, argpartition indices, block coordinates and the finished values
+VORONOII_BAND_BYTES = 288
+# Numba kernel: coordinates, F1/F2/cell id results and the finished values
+VORONOII_BAND_BYTES_JIT = 96
+# Cell-row engine: F1/F2/cell id results of the band, plus the running minima and
+# distances of one cell row at a time
+VORONOII_CELLS_BAND_BYTES = 48
+VORONOII_CELL_ROW_BYTES = 56
+# Edge distances (EDGE alpha): the pixel engines keep them for every candidate point,
+# the cell-row engine only per pixel
+VORONOII_EDGE_BAND_BYTES = 64
+VORONOII_EDGE_CELLS_BAND_BYTES = 24
+# Lattice tables per cell: two float32 per gradient or point. Building one also needs
+# float64 angles and sin/cos (Perlin), hash temporaries (HASHED) or the Python list of
+# points (Voronoi SEQUENTIAL) for a moment, counted once for the largest table.
+LATTICE_CELL_BYTES = 8
+PERLIN_BUILD_BYTES = {'SEQUENTIAL': 32, 'HASHED': 48}
+VORONOII_BUILD_BYTES = {'SEQUENTIAL': 160, 'HASHED': 64}
+# Spectral synthesis transforms the whole image at once: amplitudes, phases and the complex
+# spectrum of one channel (half width), the inverse FFT's complex pass and float64 result
+SPECTRAL_IMAGE_BYTES = 56
+
+
+def num_channels(use_color, use_alpha):
+    return (3 if use_color else 1) + (1 if use_alpha else 0)
+
+
+def image_bytes_per_pixel(noise_type, use_color, use_alpha, smoothness=0.0, storage='BYTE'):
+    """Bytes per pixel of the buffers that span the whole image"""
+    channels = num_channels(use_color, use_alpha)
+    compact = RASTER_CHANNEL_BYTES[storage] * channels
+    # The float32 working raster and its compact copy are alive together while quantizing
+    # (FLOAT keeps the working raster), the RGBA upload buffer only after that
+    quantizing = 4 * channels + (compact if storage != 'FLOAT' else 0)
+    per_pixel = IMAGE_BUFFER_BYTES[storage] + max(quantizing, compact + PIXELS_BYTES)
+    if noise_type == "voronoii":
+        if use_color:
+            # Cell IDs, the sorted copy, sort order and inverse indices of np.unique, and the
+            # gathered colors
+            per_pixel += 8 + 24 + 12
+        elif smoothness > 0.0:
+            # Full precision noise plus padded copies for the tiling blur
+            per_pixel += 8 + 3 * 8
+        # Temporaries of the min/max normalization of one channel
+        per_pixel += 8
+    elif noise_type == "spectral":
+        per_pixel += SPECTRAL_IMAGE_BYTES
+    return per_pixel
+
+
+def voronoi_engine(params, jit=False):
+    """Which Voronoi engine generates params: 'JIT', 'CELLS' (cell rows) or 'PIXELS'"""
+    from .noise_samplers import CELL_ENGINE_MIN_PIXELS
+
+    if jit:
+        return 'JIT'
+    if min(params["width"], params["height"]) / params["frequency"] >= CELL_ENGINE_MIN_PIXELS:
+        return 'CELLS'
+    return 'PIXELS'
+
+
+def _perlin_octaves(params):
+    """(cells, channels) of the lattice of every evaluated Perlin/turbulence octave"""
+    from .noise_generators import octave_fades
+
+    width, height, period = params["width"], params["height"], params["period"]
+    depth = params["depth"] if params["type"] == "turbulence" else 0
+    lacunarity = params.get("lacunarity", 2.0)
+    fades = octave_fades(period, depth, lacunarity, params.get("band_limited", False))
+    # Normal and flow maps evaluate one height field
+    if params.get("derivative_output", 'NONE') != 'NONE':
+        channels = 1
+    else:
+        channels = num_channels(params["use_color"], params["use_alpha"])
+    octaves = []
+    for lvl in range(depth + 1):
+        if fades[lvl] == 0.0:
+            continue
+        local_period = period / lacunarity ** lvl
+        octaves.append((math.ceil(width / local_period) * math.ceil(height / local_period), channels))
+    return octaves
+
+
+def _hashes_per_pixel(params):
+    """True if some octave of HASHED Perlin noise is too large for a gradient table"""
+    from .noise_samplers import HASH_TABLE_MAX_CELLS
+
+    if params.get("seed_mode", 'SEQUENTIAL') != 'HASHED':
+        return False
+    return any(cells > HASH_TABLE_MAX_CELLS for cells, _ in _perlin_octaves(params))
+
+
+def lattice_bytes(params):
+    """Bytes of the gradient or point tables of params, with the build of the largest one"""
+    from .noise_samplers import HASH_TABLE_MAX_CELLS
+
+    seed_mode = params.get("seed_mode", 'SEQUENTIAL')
+    if params["type"] in ("perlin", "turbulence"):
+        tables = [(cells, channels) for cells, channels in _perlin_octaves(params)
+                  if seed_mode != 'HASHED' or cells <= HASH_TABLE_MAX_CELLS]
+        if not tables:
+            return 0
+        # Every octave's tables stay alive until the last band is done
+        held = sum(cells * channels * LATTICE_CELL_BYTES for cells, channels in tables)
+        return held + max(cells for cells, _ in tables) * PERLIN_BUILD_BYTES[seed_mode]
+    if params["type"] == "voronoii":
+        cells = math.ceil(params["frequency"]) ** 2
+        # The main points, and an independent alpha field's own points
+        samplers = 2 if params["use_alpha"] and params.get("alpha_source", 'INDEPENDENT') == 'INDEPENDENT' else 1
+        return cells * (samplers * LATTICE_CELL_BYTES + VORONOII_BUILD_BYTES[seed_mode])
+    return 0
+
+
+def band_bytes_per_pixel(params, jit=False):
+    """Bytes per pixel of the temporaries alive while one band is evaluated"""
+    noise_type = params["type"]
+    if noise_type == "voronoii":
+        engine = voronoi_engine(params, jit)
+        edge = params["use_alpha"] and params.get("alpha_source") == 'EDGE'
+        if engine == 'CELLS':
+            return VORONOII_CELLS_BAND_BYTES + (VORONOII_EDGE_CELLS_BAND_BYTES if edge else 0)
+        return (VORONOII_BAND_BYTES_JIT if engine == 'JIT' else VORONOII_BAND_BYTES) + (VORONOII_EDGE_BAND_BYTES if edge else 0)
+    if noise_type in ("perlin", "turbulence"):
+        if _hashes_per_pixel(params):
+            return PERLIN_HASH_BAND_BYTES
+        return PERLIN_BAND_BYTES_JIT if jit else PERLIN_BAND_BYTES
+    # Spectral and composite noise are not evaluated in bands
+    return 0
+
+
+def cell_row_bytes(params, jit=False):
+    """(rows, bytes per pixel) of the cell-row engine's per cell row temporaries, (0, 0) for other engines"""
+    if params["type"] != "voronoii" or voronoi_engine(params, jit) != 'CELLS':
+        return 0, 0
+    return math.ceil(params["height"] / params["frequency"]) + 1, VORONOII_CELL_ROW_BYTES
+
+
+def fixed_bytes(params):
+    """Bytes that don't depend on the band height: whole-image buffers and noise lattices"""
+    per_pixel = image_bytes_per_pixel(
+        params["type"], params["use_color"], params["use_alpha"],
+        params.get("smoothness", 0.0), params.get("storage", 'BYTE')
+    )
+    return params["width"] * params["height"] * per_pixel + lattice_bytes(params)
+
+
+def estimate_peak_bytes(params, band_height=None, jit=False):
+    """Expected peak bytes of generating params with the given band height (None = whole image)"""
+    width, height = params["width"], params["height"]
+    band_height = height if not band_height else min(band_height, height)
+    cell_rows, cell_row_per_pixel = cell_row_bytes(params, jit)
+    return (fixed_bytes(params)
+            + width * band_height * band_bytes_per_pixel(params, jit)
+            + width * min(band_height, cell_rows) * cell_row_per_pixel)
+
+
+def rows_within(budget, fixed, params, jit=False, buffer_bytes=0):
+    """Most rows whose band temporaries, plus buffer_bytes per pixel of band buffers, fit in budget - fixed"""
+    width = params["width"]
+    per_row = width * (band_bytes_per_pixel(params, jit) + buffer_bytes)
+    cell_rows, cell_row_per_pixel = cell_row_bytes(params, jit)
+    # Bands up to a cell row high pay the cell-row temporaries per row, taller ones once
+    rows = (budget - fixed) // (per_row + width * cell_row_per_pixel)
+    if rows > cell_rows:
+        rows = (budget - fixed - width * cell_rows * cell_row_per_pixel) // per_row
+    return int(rows)
+
+
+def choose_band_height(params, budget, jit=False):
+    """Largest band height whose estimated peak fits in budget bytes, or None if nothing fits"""
+    height = params["height"]
+    fixed = fixed_bytes(params)
+    if band_bytes_per_pixel(params, jit) == 0 and cell_row_bytes(params, jit)[1] == 0:
+        return height if fixed <= budget else None
+
+    rows = rows_within(budget, fixed, params, jit)
+    if rows >= height:
+        return height
+    if rows < min(MIN_BAND_ROWS, height):
+        return None
+    return rows
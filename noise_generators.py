@@ -1,307 +1,691 @@
 import bpy
+import json
 import math
 import numpy as np
-from .noise_samplers import PerlinSampler2D, VoronoiiSampler2D
+from . import jit_kernels
+from .noise_samplers import PerlinSampler2D, PerlinChannels2D, VoronoiiSampler2D
 
-def create_perlin_noise_image(name, width, height, period, randseed, overwrite, correct_aspect, use_color, use_alpha, absolute):
-    # Image handling
-    if overwrite and name in bpy.data.images:
-        old_img = bpy.data.images[name]
-        if old_img.size[0] == width and old_img.size[1] == height:
-            img = old_img
+# Bump whenever the pixels generated for the same noise_params change (invalidates cached textures)
+GENERATOR_VERSION = 2
+
+# Element type of the compact raster kept for each storage format
+STORAGE_DTYPES = {
+    'BYTE': np.uint8,
+    'HALF': np.float16,
+    'FLOAT': np.float32,
+}
+# Rows converted at a time when no band height is given
+CONVERT_ROWS = 256
+# Generators that can write into a given (e.g. memory-mapped) float32 raster band by band
+OUT_OF_CORE_TYPES = ("perlin", "turbulence", "voronoii")
+
+# Band-limited turbulence: octaves with a period below OCTAVE_CUTOFF_PX pixels are above
+# Nyquist and skipped, octaves between that and OCTAVE_FADE_PX pixels are faded out
+OCTAVE_CUTOFF_PX = 2.0
+OCTAVE_FADE_PX = 4.0
+
+
+def turbulence_amplitudes(depth, lacunarity, atten):
+    """Amplitude of every octave; their sum bounds the turbulence before normalization"""
+    return [(1.0 / lacunarity ** lvl) ** atten for lvl in range(depth + 1)]
+
+def octave_fades(period, depth, lacunarity, band_limited):
+    """Share of every octave's noise that is kept, the rest is its expected value (0).
+
+    Without band limiting every octave is kept whole.
+    """
+    fades = []
+    for lvl in range(depth + 1):
+        local_period = period / lacunarity ** lvl
+        if not band_limited or local_period >= OCTAVE_FADE_PX:
+            fades.append(1.0)
+        elif local_period <= OCTAVE_CUTOFF_PX:
+            fades.append(0.0)
         else:
-            bpy.data.images.remove(old_img)
-            img = bpy.data.images.new(name, width, height)
+            fades.append((local_period - OCTAVE_CUTOFF_PX) / (OCTAVE_FADE_PX - OCTAVE_CUTOFF_PX))
+    return fades
+
+def normalize_raster(raster, mode, bounds=None, band_height=None):
+    """Map raster values to the 0-1 range in place, a band of rows at a time.
+
+    GLOBAL uses min/max of the whole raster, CHANNEL uses min/max of each channel,
+    ANALYTIC uses the given per-channel (low, high) bounds and needs no pass over the image.
+    """
+    if mode == 'ANALYTIC':
+        channel_ranges = bounds
+    elif mode == 'CHANNEL':
+        channel_ranges = [(np.min(raster[..., k]), np.max(raster[..., k])) for k in range(raster.shape[-1])]
     else:
-        img = bpy.data.images.new(name, width, height)
+        channel_ranges = [(np.min(raster), np.max(raster))] * raster.shape[-1]
 
-    # Channel setup
-    num_channels = 3 if use_color else 1
-    if use_alpha:
-        num_channels += 1
+    for start, stop in row_bands(raster.shape[0], band_height):
+        band = raster[start:stop]
+        for k, (min_val, max_val) in enumerate(channel_ranges):
+            if max_val > min_val:
+                band[..., k] = np.clip((band[..., k] - min_val) / (max_val - min_val), 0.0, 1.0)
+            else:
+                band[..., k] = 0.0
+    return raster
 
-    # Generate coordinate grid
-    j, i = np.meshgrid(np.arange(width), np.arange(height))
-    raster = np.zeros((height, width, num_channels), dtype=np.float32)
+def quantize_raster(raster, storage, out=None):
+    """Convert a 0-1 float32 raster to the compact element type of storage, CONVERT_ROWS rows at a time.
 
-    # Generate noise per channel
-    for k in range(num_channels):
-        channel_seed = randseed + k * 1000  # Unique seed per channel
-        sampler = PerlinSampler2D(
-            math.ceil(width/period),
-            math.ceil(height/period),
-            channel_seed
-        )
-        
-        x_coords = j / period
-        y_coords = i / period
-        noise = sampler.get_value_vectorized(x_coords, y_coords)
-        raster[..., k] = noise
+    Writes into `out` when given (e.g. a memmap), otherwise into a new array. The band
+    size is fixed rather than the generation band height, so the float temporary of the
+    byte conversion stays small whatever the image size.
+    """
+    dtype = STORAGE_DTYPES[storage]
+    if raster.dtype == dtype and out is None:
+        return raster
+    compact = np.empty(raster.shape, dtype=dtype) if out is None else out
+    for start, stop in row_bands(raster.shape[0], CONVERT_ROWS):
+        if dtype == np.uint8:
+            band = raster[start:stop] * 255.0
+            np.clip(band, 0.0, 255.0, out=band)
+            np.rint(band, out=band)
+            compact[start:stop] = band
+        else:
+            compact[start:stop] = raster[start:stop]
+    return compact
 
-    # Post-processing
-    if absolute:
-        raster = np.abs(raster)
-    else:
-        raster = (raster + 1) / 2
+def pack_pixels(raster, use_color, use_alpha, band_height=None):
+    """Expand a compact (height, width, channels) raster to the RGBA float buffer Blender expects.
 
-    # Create pixel array
-    pixels = np.zeros((height, width, 4), dtype=np.float32)
-    if use_color:
-        pixels[..., :3] = raster[..., :3]
-        if num_channels > 3:
-            pixels[..., 3] = raster[..., 3]
-    else:
-        pixels[..., :3] = raster[..., 0][..., np.newaxis]
-    
-    if not use_alpha:
-        pixels[..., 3] = 1.0
+    Byte rasters are scaled back to 0-1; bands are converted one at a time, so no other
+    full-size float copy of the raster is made.
+    """
+    height, width = raster.shape[:2]
+    scale = 1.0 / 255.0 if raster.dtype == np.uint8 else 1.0
+    pixels = np.empty((height, width, 4), dtype=np.float32)
+    for start, stop in row_bands(height, band_height or CONVERT_ROWS):
+        band = raster[start:stop]
+        if use_color:
+            pixels[start:stop, :, :3] = band[..., :3]
+        else:
+            pixels[start:stop, :, :3] = band[..., :1]
+        if use_alpha:
+            pixels[start:stop, :, 3] = band[..., -1]
+        else:
+            pixels[start:stop, :, 3] = 1.0
+        if scale != 1.0:
+            pixels[start:stop, :, :4 if use_alpha else 3] *= scale
+    return pixels
 
-    # Assign pixels
-    img.pixels.foreach_set(pixels.ravel())
-    img.update()
+def row_bands(height, band_height=None):
+    """(start, stop) row ranges covering the image, band_height rows at a time"""
+    band_height = height if not band_height else max(1, int(band_height))
+    for start in range(0, height, band_height):
+        yield start, min(start + band_height, height)
 
-    # Aspect ratio
-    if correct_aspect:
-        img.display_aspect = (1, width/height) if width > height else (height/width, 1)
-    else:
-        img.display_aspect = (1.0, 1.0)
+def perlin_sampler(width, height, randseed, seed_mode, channel, octave=0):
+    """Perlin sampler of one channel/octave: offset seeds when SEQUENTIAL, hash inputs when HASHED"""
+    if seed_mode == 'HASHED':
+        return PerlinSampler2D(width, height, randseed, seed_mode, channel, octave)
+    return PerlinSampler2D(width, height, randseed + channel * 1000 + octave * 10000)
 
-    # Store parameters in metadata
-    img["noise_params"] = {
-        "type": "perlin",
-        "width": width,
-        "height": height,
-        "period": period,
-        "seed": randseed,
-        "use_color": use_color,
-        "use_alpha": use_alpha,
-        "absolute": absolute,
-        "correct_aspect": correct_aspect,
-        "turbulence": False
-    }
+def accumulate_perlin_channels(band, start, period, channels, amplitude):
+    """band[..., k] += amplitude * noise of channel k for the rows from start, all channels in one pass"""
+    if jit_kernels.enabled() and channels.gradients is not None:
+        # Fused kernel, no coordinate or intermediate arrays
+        jit_kernels.perlin_accumulate_channels(band, period, channels.gradients, channels.width, channels.height, amplitude, start)
+        return
+    # Generate coordinate grid for the band
+    j, i = np.meshgrid(np.arange(band.shape[1]), np.arange(start, start + band.shape[0]))
+    x_coords = j / period
+    y_coords = i / period
+    band += channels.get_values_vectorized(x_coords, y_coords) * amplitude
 
-    return img
+def new_raster(height, width, num_channels, out=None):
+    """Zeroed float32 working raster, or `out` (e.g. a fresh memmap, already zeroed) when given"""
+    if out is None:
+        return np.zeros((height, width, num_channels), dtype=np.float32)
+    if out.shape != (height, width, num_channels) or out.dtype != np.float32:
+        raise ValueError(f"Target must be float32 {(height, width, num_channels)}, got {out.dtype} {out.shape}")
+    return out
 
-def create_turbulence_image(name, width, height, period, randseed, depth, lacunarity, atten, use_color, use_alpha, absolute, overwrite, correct_aspect):
-    # Image handling (same as Perlin)
-    if overwrite and name in bpy.data.images:
-        old_img = bpy.data.images[name]
-        if old_img.size[0] == width and old_img.size[1] == height:
-            img = old_img
+def perlin_raster(width, height, period, randseed, use_color, use_alpha, absolute, seed_mode='SEQUENTIAL', derivative_output='NONE', normal_strength=1.0, band_height=None, out=None):
+    if derivative_output != 'NONE':
+        return derivative_raster(
+            width, height, period, randseed, [1.0], [1.0], 1.0, use_alpha, absolute,
+            derivative_output, normal_strength, seed_mode, band_height, out
+        )
+
+    # Channel setup
+    num_channels = 3 if use_color else 1
+    if use_alpha:
+        num_channels += 1
+
+    raster = new_raster(height, width, num_channels, out)
+
+    # Unique lattice per channel, all channels evaluated together
+    channels = PerlinChannels2D([
+        perlin_sampler(math.ceil(width/period), math.ceil(height/period), randseed, seed_mode, k)
+        for k in range(num_channels)
+    ])
+    for start, stop in row_bands(height, band_height):
+        band = raster[start:stop]
+        accumulate_perlin_channels(band, start, period, channels, 1.0)
+
+        # Post-processing
+        if absolute:
+            np.abs(band, out=band)
         else:
-            bpy.data.images.remove(old_img)
-            img = bpy.data.images.new(name, width, height)
-    else:
-        img = bpy.data.images.new(name, width, height)
+            band += 1
+            band /= 2
+
+    return raster
+
+def turbulence_raster(width, height, period, randseed, depth, lacunarity, atten, use_color, use_alpha, absolute, band_limited=False, seed_mode='SEQUENTIAL', derivative_output='NONE', normal_strength=1.0, band_height=None, out=None):
+    amplitudes = turbulence_amplitudes(depth, lacunarity, atten)
+    fades = octave_fades(period, depth, lacunarity, band_limited)
+    if derivative_output != 'NONE':
+        return derivative_raster(
+            width, height, period, randseed, amplitudes, fades, lacunarity, use_alpha, absolute,
+            derivative_output, normal_strength, seed_mode, band_height, out
+        )
 
     # Channel setup
     num_channels = 3 if use_color else 1
     if use_alpha:
         num_channels += 1
 
-    # Generate coordinate grid
-    j, i = np.meshgrid(np.arange(width), np.arange(height))
-    raster = np.zeros((height, width, num_channels), dtype=np.float32)
-    weight_total = 0.0
+    raster = new_raster(height, width, num_channels, out)
 
-    # Multi-octave generation
-    for lvl in range(depth+1):
-        freq = lacunarity ** lvl
-        amplitude = (1.0/freq) ** atten
-        local_period = period / freq
-        
-        for k in range(num_channels):
-            channel_seed = randseed + k * 1000 + lvl * 10000  # Unique per channel/octave
-            sampler = PerlinSampler2D(
-                math.ceil(width / local_period),
-                math.ceil(height / local_period),
-                channel_seed
-            )
-            
-            x_coords = j / local_period
-            y_coords = i / local_period
-            noise = sampler.get_value_vectorized(x_coords, y_coords)
-            raster[..., k] += noise * amplitude
-        
-        weight_total += amplitude
-
-    # Normalize and process
-    raster /= weight_total
-    if absolute:
-        raster = np.abs(raster)
-    else:
-        raster = (raster + 1) / 2
+    # (period, lattices, amplitude) of every evaluated octave; unique lattice per
+    # channel/octave, the channels of an octave share the geometry
+    octaves = []
+    for lvl, full_amplitude in enumerate(amplitudes):
+        if fades[lvl] == 0.0:
+            # Unresolved octave, its expected contribution is 0
+            continue
+        local_period = period / lacunarity ** lvl
+        channels = PerlinChannels2D([
+            perlin_sampler(math.ceil(width / local_period), math.ceil(height / local_period), randseed, seed_mode, k, lvl)
+            for k in range(num_channels)
+        ])
+        octaves.append((local_period, channels, full_amplitude * fades[lvl]))
 
-    # Pixel packaging (same as Perlin)
-    pixels = np.zeros((height, width, 4), dtype=np.float32)
-    if use_color:
-        pixels[..., :3] = raster[..., :3]
-        if num_channels > 3:
-            pixels[..., 3] = raster[..., 3]
-    else:
-        pixels[..., :3] = raster[..., 0][..., np.newaxis]
-    
-    if not use_alpha:
-        pixels[..., 3] = 1.0
+    # Every band is finished before the next, so a memory-mapped raster is written once
+    for start, stop in row_bands(height, band_height):
+        band = raster[start:stop]
+        for local_period, channels, amplitude in octaves:
+            accumulate_perlin_channels(band, start, local_period, channels, amplitude)
 
-    img.pixels.foreach_set(pixels.ravel())
-    img.update()
+        # Normalize by the full amplitude sum (skipped octaves included) and process
+        band /= sum(amplitudes)
+        if absolute:
+            np.abs(band, out=band)
+        else:
+            band += 1
+            band /= 2
 
-    # Aspect ratio
-    if correct_aspect:
-        img.display_aspect = (1, width/height) if width > height else (height/width, 1)
-    else:
-        img.display_aspect = (1.0, 1.0)
-    
-    # Store parameters in metadata
-    img["noise_params"] = {
-        "type": "turbulence",
-        "width": width,
-        "height": height,
-        "period": period,
-        "seed": randseed,
-        "depth": depth,
-        "lacunarity": lacunarity,
-        "atten": atten,
-        "use_color": use_color,
-        "use_alpha": use_alpha,
-        "absolute": absolute,
-        "correct_aspect": correct_aspect,
-        "turbulence": True
-    }
+    return raster
 
-    return img
+def derivative_raster(width, height, period, randseed, amplitudes, fades, lacunarity, use_alpha, absolute, output, strength, seed_mode='SEQUENTIAL', band_height=None, out=None):
+    """Normal or flow map (RGB) of a Perlin/turbulence height field, height in alpha.
 
-def create_voronoii_noise_image(name, width, height, frequency, randseed, return_type, use_color, use_alpha, overwrite, correct_aspect, smoothness=0.0, randomness=1.0, minkowski_exponent=3.0):
-    # Image handling
-    if overwrite and name in bpy.data.images:
-        old_img = bpy.data.images[name]
-        if old_img.size[0] == width and old_img.size[1] == height:
-            img = old_img
+    Value and analytic derivatives of every octave are accumulated in the same pass, so
+    no height map has to be differenced afterwards. Slopes are per `period` pixels.
+    """
+    num_channels = 4 if use_alpha else 3
+    # Accumulators: value, d/dx and d/dy, turned into the output colors in place
+    raster = new_raster(height, width, num_channels, out)
+
+    # One height field, the lattice of the first channel
+    octaves = []
+    for lvl, full_amplitude in enumerate(amplitudes):
+        if fades[lvl] == 0.0:
+            continue
+        freq = lacunarity ** lvl
+        local_period = period / freq
+        sampler = perlin_sampler(
+            math.ceil(width / local_period),
+            math.ceil(height / local_period),
+            randseed, seed_mode, 0, lvl
+        )
+        octaves.append((local_period, freq, sampler, full_amplitude * fades[lvl]))
+
+    total = sum(amplitudes)
+    for start, stop in row_bands(height, band_height):
+        band = raster[start:stop]
+        for local_period, freq, sampler, amplitude in octaves:
+            if jit_kernels.enabled() and sampler.gradients is not None:
+                jit_kernels.perlin_accumulate_derivatives(
+                    band[..., 0], band[..., 1], band[..., 2], local_period,
+                    sampler.gradients, sampler.width, sampler.height, amplitude, freq, start
+                )
+                continue
+            j, i = np.meshgrid(np.arange(width), np.arange(start, stop))
+            value, d_dx, d_dy = sampler.get_value_vectorized(j / local_period, i / local_period, derivatives=True)
+            band[..., 0] += value * amplitude
+            # Lattice units of this octave to lattice units of the first one
+            band[..., 1] += d_dx * (amplitude * freq)
+            band[..., 2] += d_dy * (amplitude * freq)
+
+        value = band[..., 0] / total
+        if absolute:
+            slope_scale = np.sign(value) * (strength / total)
+            value = np.abs(value)
         else:
-            bpy.data.images.remove(old_img)
-            img = bpy.data.images.new(name, width, height)
-    else:
-        img = bpy.data.images.new(name, width, height)
+            slope_scale = strength / (2 * total)
+            value = (value + 1) / 2
+        d_dx = band[..., 1] * slope_scale
+        d_dy = band[..., 2] * slope_scale
+        if output == 'NORMAL':
+            # Tangent space normal (-dh/dx, -dh/dy, 1), +Y up as Blender expects
+            inv_length = 1 / np.sqrt(d_dx * d_dx + d_dy * d_dy + 1)
+            band[..., 0] = 0.5 - 0.5 * d_dx * inv_length
+            band[..., 1] = 0.5 - 0.5 * d_dy * inv_length
+            band[..., 2] = 0.5 + 0.5 * inv_length
+        else:  # FLOW
+            # Curl of the height, a divergence-free flow along the contour lines
+            band[..., 0] = 0.5 + 0.5 * np.clip(d_dy, -1, 1)
+            band[..., 1] = 0.5 - 0.5 * np.clip(d_dx, -1, 1)
+            band[..., 2] = 0.0
+        if use_alpha:
+            band[..., 3] = value
 
+    return raster
+
+def voronoii_raster(width, height, frequency, randseed, return_type, use_color, use_alpha, smoothness=0.0, randomness=1.0, minkowski_exponent=3.0, normalization='GLOBAL', seed_mode='SEQUENTIAL', alpha_source='INDEPENDENT', band_height=None, out=None):
     # Channel setup
     num_channels = 3 if use_color else 1
     if use_alpha:
         num_channels += 1
 
-    # Generate coordinate grid
-    j, i = np.meshgrid(np.arange(width), np.arange(height))
-    raster = np.zeros((height, width, num_channels), dtype=np.float32)
-
-    # Normalize coordinates to 0-1 range
-    x_coords = j / width
-    y_coords = i / height
+    raster = new_raster(height, width, num_channels, out)
     
     # Create sampler with appropriate grid size
     sampler = VoronoiiSampler2D(
         math.ceil(frequency),
         math.ceil(frequency),
         randseed,
-        randomness=randomness
+        randomness=randomness,
+        seed_mode=seed_mode
     )
-    
-    # Generate noise
-    if use_color:
-        # Generate cell IDs and convert to colors
-        noise, cell_ids = sampler.get_value_vectorized(x_coords, y_coords, frequency, return_type, return_cell_id=True, smoothness=smoothness, minkowski_exponent=minkowski_exponent)
-        
-        # Convert cell IDs to colors
-        unique_ids = np.unique(cell_ids)
-        num_unique = len(unique_ids)
-        
-        # Create color map with random RGB values for each unique cell ID
-        id_to_color = {}
-        
-        # Seed the random number generator for consistent results
-        np.random.seed(randseed)
-        
-        for cell_id in unique_ids:
-            # Generate random RGB values between 0.1 and 1.0 for better visibility
-            r = np.random.uniform(0.1, 1.0)
-            g = np.random.uniform(0.1, 1.0)
-            b = np.random.uniform(0.1, 1.0)
-            
-            id_to_color[cell_id] = (r, g, b)
-        
-        # Apply color mapping to cell IDs
-        color_raster = np.zeros((height, width, 3), dtype=np.float32)
-        for cell_id, color in id_to_color.items():
-            mask = cell_ids == cell_id
-            color_raster[mask] = color
-        
-        # Assign color channels
-        raster[..., :3] = color_raster
-        
-        if num_channels > 3:
-            # Generate alpha channel (if requested)
+    # Alpha channel (if requested) is an independent field with a different seed (or hash channel),
+    # or derived from the neighbor search of the main channel
+    sampler_alpha = None
+    derived_alpha = alpha_source if use_alpha and alpha_source != 'INDEPENDENT' else None
+    if use_alpha and not derived_alpha:
+        if seed_mode == 'HASHED':
             sampler_alpha = VoronoiiSampler2D(
                 math.ceil(frequency),
                 math.ceil(frequency),
-                randseed + 10000  # Different seed for alpha
+                randseed,
+                seed_mode=seed_mode,
+                channel=num_channels - 1
             )
-            alpha_noise = sampler_alpha.get_value_vectorized(x_coords, y_coords, frequency, return_type, minkowski_exponent=minkowski_exponent)
-            raster[..., 3] = alpha_noise
-    else:
-        # Generate single channel noise
-        noise = sampler.get_value_vectorized(x_coords, y_coords, frequency, return_type, smoothness=smoothness, minkowski_exponent=minkowski_exponent)
-        raster[..., 0] = noise
-        
-        # If alpha channel is requested, generate it with a different seed
-        if num_channels > 1:
+        else:
             sampler_alpha = VoronoiiSampler2D(
                 math.ceil(frequency),
                 math.ceil(frequency),
-                randseed + 10000  # Different seed for alpha
+                randseed + 10000
             )
-            alpha_noise = sampler_alpha.get_value_vectorized(x_coords, y_coords, frequency, return_type, minkowski_exponent=minkowski_exponent)
-            raster[..., 1] = alpha_noise
+
+    # Color mode only needs cell IDs, grayscale keeps full precision noise for smoothing
+    cell_ids = np.empty((height, width), dtype=np.int64) if use_color else None
+    noise = np.empty((height, width)) if not use_color and smoothness > 0.0 else None
+
+    for start, stop in row_bands(height, band_height):
+        # Evaluated at the normalized 0-1 coordinates of the band
+        values = sampler.get_value_grid(width, height, start, stop, frequency, return_type, return_cell_id=use_color, minkowski_exponent=minkowski_exponent, alpha_source=derived_alpha)
+        if derived_alpha:
+            # Derived alpha comes last
+            raster[start:stop, :, num_channels - 1] = values[-1]
+            values = values[:-1] if use_color else values[0]
+        if use_color:
+            cell_ids[start:stop] = values[1]
+        elif noise is not None:
+            noise[start:stop] = values
+        else:
+            raster[start:stop, :, 0] = values
+
+        if sampler_alpha:
+            raster[start:stop, :, num_channels - 1] = sampler_alpha.get_value_grid(width, height, start, stop, frequency, return_type, minkowski_exponent=minkowski_exponent)
+
+    if use_color:
+        # Convert cell IDs to colors, random RGB between 0.1 and 1.0 per unique ID (sorted),
+        # seeded for consistent results. A private RandomState keeps worker threads independent.
+        unique_ids, inverse = np.unique(cell_ids.ravel(), return_inverse=True)
+        colors = np.random.RandomState(randseed).uniform(0.1, 1.0, size=(len(unique_ids), 3)).astype(np.float32)
+        raster[..., :3] = colors[inverse].reshape(height, width, 3)
+        del cell_ids, inverse
+    elif noise is not None:
+        # Smoothing needs the whole (tiling) image, so it runs once after all bands
+        raster[..., 0] = sampler.smooth(noise, smoothness, frequency)
+        del noise
 
     # Normalize noise values to 0-1 range
-    min_val = np.min(raster)
-    max_val = np.max(raster)
-    if max_val > min_val:
-        raster = (raster - min_val) / (max_val - min_val)
+    bounds = None
+    if normalization == 'ANALYTIC':
+        # Cell colors are already in range, distance channels use the sampler's theoretical bounds
+        bounds = [(0.0, 1.0)] * 3 if use_color else [sampler.value_bounds(return_type, minkowski_exponent)]
+        if sampler_alpha:
+            bounds.append(sampler_alpha.value_bounds(return_type, minkowski_exponent))
+        elif derived_alpha:
+            bounds.append(sampler.alpha_bounds(derived_alpha, return_type, minkowski_exponent))
+    normalize_raster(raster, normalization, bounds, band_height)
+
+    return raster
+
+def spectral_amplitudes(width, height, period, depth, lacunarity, atten):
+    """Amplitude of every rfft2 bin of a spectral fractal noise (shape (height, width // 2 + 1)).
+
+    Octave `lvl` of the turbulence has wavelength period / lacunarity**lvl and amplitude
+    (1 / lacunarity**lvl) ** atten. Spreading that over the 2D frequency plane gives a
+    power law |F(k)| ~ k ** -(atten + 1) between half the base frequency and the finest octave.
+    """
+    ky = np.fft.fftfreq(height)[:, None]
+    kx = np.fft.rfftfreq(width)[None, :]
+    k = np.hypot(kx, ky)
+    k_min = 0.5 / period
+    k_max = min(lacunarity ** depth / period, 0.5)
+    amplitudes = np.zeros_like(k)
+    band = (k >= k_min) & (k <= k_max)
+    amplitudes[band] = (k[band] * period) ** -(atten + 1.0)
+    return amplitudes
+
+def spectral_raster(width, height, period, randseed, depth, lacunarity, atten, use_color, use_alpha, absolute, band_height=None):
+    """Fractal noise from random phases shaped by a power-law spectrum and an inverse real FFT.
+
+    Periodic at any image size and the cost doesn't grow with depth. Every channel has
+    its own phases; values are scaled from the spectrum's energy (Parseval), not from a
+    pass over the image. The FFT needs the whole image, band_height is ignored.
+    """
+    num_channels = 3 if use_color else 1
+    if use_alpha:
+        num_channels += 1
+
+    raster = np.zeros((height, width, num_channels), dtype=np.float32)
+    amplitudes = spectral_amplitudes(width, height, period, depth, lacunarity, atten)
+
+    # Hermitian symmetric columns (kx = 0 and, for even widths, Nyquist) appear once in the
+    # full spectrum, every other column twice. Mean of the squared output = energy / N**2.
+    weights = np.full(amplitudes.shape[1], 2.0)
+    weights[0] = 1.0
+    if width % 2 == 0:
+        weights[-1] = 1.0
+    energy = np.sum((amplitudes ** 2) * weights)
+    # RMS of 0.25 keeps the clipped tails (4 sigma) negligible
+    scale = 0.25 * width * height / math.sqrt(energy) if energy > 0 else 0.0
+
+    for k in range(num_channels):
+        rand = np.random.RandomState(randseed + k * 1000)
+        phases = rand.uniform(0.0, 2.0 * math.pi, size=amplitudes.shape)
+        # Self-conjugate columns need phase(-ky) = -phase(ky) for a real result
+        for column in ((0, -1) if width % 2 == 0 else (0,)):
+            _make_odd(phases[:, column])
+        raster[..., k] = np.fft.irfft2(amplitudes * scale * np.exp(1j * phases), s=(height, width))
+
+    np.clip(raster, -1.0, 1.0, out=raster)
+    if absolute:
+        np.abs(raster, out=raster)
     else:
-        raster = np.zeros_like(raster)
+        raster += 1
+        raster /= 2
 
-    # Create pixel array
-    pixels = np.zeros((height, width, 4), dtype=np.float32)
-    if use_color:
-        pixels[..., :3] = raster[..., :3]
-        if num_channels > 3:
-            pixels[..., 3] = raster[..., 3]
+    return raster
+
+def _make_odd(values):
+    """Make values[-i] == -values[i] (indices mod len), in place"""
+    n = len(values)
+    values[0] = 0.0
+    if n % 2 == 0:
+        values[n // 2] = 0.0
+    values[n // 2 + 1:] = -values[1:(n + 1) // 2][::-1]
+
+def composite_raster(width, height, graph, normalize=True, band_height=None):
+    """Bake a composition expression (node or recipe) into a grayscale raster, tile by tile"""
+    from .composition import bake, from_recipe
+
+    root = from_recipe(graph) if isinstance(graph, (str, dict)) else graph
+    raster = bake(root, width, height, tile_size=band_height or 256)[..., np.newaxis]
+    if normalize:
+        normalize_raster(raster, 'GLOBAL')
     else:
-        pixels[..., :3] = raster[..., 0][..., np.newaxis]
-    
-    if not use_alpha:
-        pixels[..., 3] = 1.0
+        np.clip(raster, 0.0, 1.0, out=raster)
+    return raster
+
+def generate_raster(params, band_height=None):
+    """Compute the compact raster described by a noise_params dict
+
+    The raster has one channel per generated channel (gray, gray + alpha, RGB or RGBA)
+    and the element type of params["storage"]. band_height limits how many rows are
+    evaluated at once, bounding temporary memory.
+    """
+    raster = _generate_float_raster(params, band_height)
+    return quantize_raster(raster, params.get("storage", 'BYTE'))
 
-    # Assign pixels
+def generate_pixels(params, band_height=None):
+    """Compute the RGBA float pixel buffer described by a noise_params dict"""
+    return pack_pixels(generate_raster(params, band_height), params["use_color"], params["use_alpha"], band_height)
+
+def _generate_float_raster(params, band_height=None, out=None):
+    """0-1 float32 raster of params; out-of-core capable types write into `out` when given"""
+    if out is not None and params["type"] not in OUT_OF_CORE_TYPES:
+        raise ValueError(f"{params['type']} noise can't be generated into a target array")
+    if params["type"] == "perlin":
+        return perlin_raster(
+            params["width"], params["height"], params["period"], params["seed"],
+            params["use_color"], params["use_alpha"], params["absolute"],
+            seed_mode=params.get("seed_mode", 'SEQUENTIAL'),
+            derivative_output=params.get("derivative_output", 'NONE'),
+            normal_strength=params.get("normal_strength", 1.0),
+            band_height=band_height,
+            out=out
+        )
+    if params["type"] == "turbulence":
+        return turbulence_raster(
+            params["width"], params["height"], params["period"], params["seed"],
+            params["depth"], params["lacunarity"], params["atten"],
+            params["use_color"], params["use_alpha"], params["absolute"],
+            band_limited=params.get("band_limited", False),
+            seed_mode=params.get("seed_mode", 'SEQUENTIAL'),
+            derivative_output=params.get("derivative_output", 'NONE'),
+            normal_strength=params.get("normal_strength", 1.0),
+            band_height=band_height,
+            out=out
+        )
+    if params["type"] == "spectral":
+        return spectral_raster(
+            params["width"], params["height"], params["period"], params["seed"],
+            params["depth"], params["lacunarity"], params["atten"],
+            params["use_color"], params["use_alpha"], params["absolute"],
+            band_height=band_height
+        )
+    if params["type"] == "voronoii":
+        return voronoii_raster(
+            params["width"], params["height"], params["frequency"], params["seed"], params["return_type"],
+            params["use_color"], params["use_alpha"],
+            smoothness=params.get("smoothness", 0.0),
+            randomness=params.get("randomness", 1.0),
+            minkowski_exponent=params.get("minkowski_exponent", 3.0),
+            normalization=params.get("normalization", 'GLOBAL'),
+            seed_mode=params.get("seed_mode", 'SEQUENTIAL'),
+            alpha_source=params.get("alpha_source", 'INDEPENDENT'),
+            band_height=band_height,
+            out=out
+        )
+    if params["type"] == "composite":
+        return composite_raster(
+            params["width"], params["height"], params["graph"], params["normalize"],
+            band_height=band_height
+        )
+    raise ValueError(f"Unknown noise type: {params['type']}")
+
+def get_image(name, width, height, overwrite, storage='BYTE'):
+    """Reuse the named image when overwriting with the same size and buffer type, otherwise create a new one"""
+    float_buffer = storage != 'BYTE'
+    if overwrite and name in bpy.data.images:
+        old_img = bpy.data.images[name]
+        if old_img.size[0] == width and old_img.size[1] == height and old_img.is_float == float_buffer:
+            old_img.use_half_precision = storage == 'HALF'
+            return old_img
+        bpy.data.images.remove(old_img)
+    img = bpy.data.images.new(name, width, height, alpha=True, float_buffer=float_buffer)
+    img.use_half_precision = storage == 'HALF'
+    return img
+
+def apply_noise_params(img, params, cache=None, band_height=None):
+    """Fill img with the pixels described by params (from cache when possible) and store the params"""
+    return finish_image(img, load_or_generate(params, cache, band_height), params, band_height)
+
+def load_or_generate(params, cache=None, band_height=None):
+    """Compact raster of params from the cache, generated (and stored) on a miss. Safe in worker threads."""
+    raster = cache.load(params) if cache else None
+    if raster is None:
+        raster = generate_raster(params, band_height)
+        if cache:
+            cache.store(params, raster)
+    return raster
+
+def fill_image(img, raster, params, band_height=None):
+    """Upload a compact raster into img and set its display aspect (main thread only)"""
+    # Assign pixels, Blender images always hold RGBA
+    pixels = pack_pixels(raster, params["use_color"], params["use_alpha"], band_height)
     img.pixels.foreach_set(pixels.ravel())
     img.update()
 
     # Aspect ratio
-    if correct_aspect:
+    width, height = params["width"], params["height"]
+    if params["correct_aspect"]:
         img.display_aspect = (1, width/height) if width > height else (height/width, 1)
     else:
         img.display_aspect = (1.0, 1.0)
 
+def finish_image(img, raster, params, band_height=None):
+    """Upload a generated raster into img and store its params (main thread only)"""
+    fill_image(img, raster, params, band_height)
+
     # Store parameters in metadata
-    img["noise_params"] = {
+    img["noise_params"] = params
+    if params["type"] == "turbulence":
+        # Kept next to the params, which must only hold settings (they are the cache key)
+        fades = octave_fades(params["period"], params["depth"], params["lacunarity"], params.get("band_limited", False))
+        img["noise_octaves_evaluated"] = sum(1 for fade in fades if fade > 0.0)
+    return img
+
+def perlin_params(width, height, period, randseed, use_color, use_alpha, absolute, correct_aspect, storage='BYTE', seed_mode='SEQUENTIAL', derivative_output='NONE', normal_strength=1.0):
+    return {
+        "type": "perlin",
+        "width": width,
+        "height": height,
+        "period": period,
+        "seed": randseed,
+        "seed_mode": seed_mode,
+        # Normal and flow maps always fill RGB
+        "use_color": use_color or derivative_output != 'NONE',
+        "use_alpha": use_alpha,
+        "absolute": absolute,
+        "derivative_output": derivative_output,
+        "normal_strength": normal_strength,
+        "storage": storage,
+        "correct_aspect": correct_aspect,
+        "turbulence": False
+    }
+
+def turbulence_params(width, height, period, randseed, depth, lacunarity, atten, use_color, use_alpha, absolute, correct_aspect, band_limited=False, storage='BYTE', seed_mode='SEQUENTIAL', derivative_output='NONE', normal_strength=1.0):
+    return {
+        "type": "turbulence",
+        "width": width,
+        "height": height,
+        "period": period,
+        "seed": randseed,
+        "seed_mode": seed_mode,
+        "depth": depth,
+        "lacunarity": lacunarity,
+        "atten": atten,
+        # Normal and flow maps always fill RGB
+        "use_color": use_color or derivative_output != 'NONE',
+        "use_alpha": use_alpha,
+        "absolute": absolute,
+        "band_limited": band_limited,
+        "derivative_output": derivative_output,
+        "normal_strength": normal_strength,
+        "storage": storage,
+        "correct_aspect": correct_aspect,
+        "turbulence": True
+    }
+
+def spectral_params(width, height, period, randseed, depth, lacunarity, atten, use_color, use_alpha, absolute, correct_aspect, storage='BYTE'):
+    return {
+        "type": "spectral",
+        "width": width,
+        "height": height,
+        "period": period,
+        "seed": randseed,
+        "depth": depth,
+        "lacunarity": lacunarity,
+        "atten": atten,
+        "use_color": use_color,
+        "use_alpha": use_alpha,
+        "absolute": absolute,
+        "storage": storage,
+        "correct_aspect": correct_aspect,
+        "engine": 'SPECTRAL',
+        "turbulence": depth > 0
+    }
+
+def voronoii_params(width, height, frequency, randseed, return_type, use_color, use_alpha, correct_aspect, smoothness=0.0, randomness=1.0, minkowski_exponent=3.0, normalization='GLOBAL', storage='BYTE', seed_mode='SEQUENTIAL', alpha_source='INDEPENDENT'):
+    return {
         "type": "voronoii",
         "width": width,
         "height": height,
         "frequency": frequency,
         "seed": randseed,
+        "seed_mode": seed_mode,
         "return_type": return_type,
+        "minkowski_exponent": minkowski_exponent,
+        "smoothness": smoothness,
+        "randomness": randomness,
+        "normalization": normalization,
         "use_color": use_color,
         "use_alpha": use_alpha,
+        "alpha_source": alpha_source,
+        "storage": storage,
         "correct_aspect": correct_aspect
     }
-    
-    return img
\ No newline at end of file
+
+def create_perlin_noise_image(name, width, height, period, randseed, overwrite, correct_aspect, use_color, use_alpha, absolute, storage='BYTE', seed_mode='SEQUENTIAL', derivative_output='NONE', normal_strength=1.0, cache=None, band_height=None):
+    img = get_image(name, width, height, overwrite, storage)
+    params = perlin_params(width, height, period, randseed, use_color, use_alpha, absolute, correct_aspect, storage, seed_mode, derivative_output, normal_strength)
+    return apply_noise_params(img, params, cache, band_height)
+
+def create_turbulence_image(name, width, height, period, randseed, depth, lacunarity, atten, use_color, use_alpha, absolute, overwrite, correct_aspect, band_limited=False, storage='BYTE', seed_mode='SEQUENTIAL', derivative_output='NONE', normal_strength=1.0, cache=None, band_height=None):
+    """Turbulence image; with derivative_output NORMAL or FLOW the octaves' analytic derivatives
+    are accumulated with their values and written as a normal or flow map"""
+    img = get_image(name, width, height, overwrite, storage)
+    params = turbulence_params(width, height, period, randseed, depth, lacunarity, atten, use_color, use_alpha, absolute, correct_aspect, band_limited, storage, seed_mode, derivative_output, normal_strength)
+    return apply_noise_params(img, params, cache, band_height)
+
+def create_spectral_image(name, width, height, period, randseed, depth, lacunarity, atten, use_color, use_alpha, absolute, overwrite, correct_aspect, storage='BYTE', cache=None, band_height=None):
+    """Turbulence-like fractal noise by spectral synthesis, tiles at any size (see spectral_raster)"""
+    img = get_image(name, width, height, overwrite, storage)
+    params = spectral_params(width, height, period, randseed, depth, lacunarity, atten, use_color, use_alpha, absolute, correct_aspect, storage)
+    return apply_noise_params(img, params, cache, band_height)
+
+def create_voronoii_noise_image(name, width, height, frequency, randseed, return_type, use_color, use_alpha, overwrite, correct_aspect, smoothness=0.0, randomness=1.0, minkowski_exponent=3.0, normalization='GLOBAL', storage='BYTE', seed_mode='SEQUENTIAL', alpha_source='INDEPENDENT', cache=None, band_height=None):
+    """Voronoi image; alpha_source picks what the alpha channel shows (see noise_samplers.ALPHA_SOURCES)"""
+    img = get_image(name, width, height, overwrite, storage)
+    params = voronoii_params(
+        width, height, frequency, randseed, return_type, use_color, use_alpha, correct_aspect,
+        smoothness, randomness, minkowski_exponent, normalization, storage, seed_mode, alpha_source
+    )
+    return apply_noise_params(img, params, cache, band_height)
+
+def create_composite_image(name, graph, width, height, overwrite, correct_aspect, normalize=True, storage='BYTE', cache=None, band_height=None):
+    """Bake a composition.NoiseNode expression into one image (see composition.py)"""
+    img = get_image(name, width, height, overwrite, storage)
+    params = {
+        "type": "composite",
+        "width": width,
+        "height": height,
+        "graph": json.dumps(graph.to_recipe(), sort_keys=True),
+        "normalize": normalize,
+        "use_color": False,
+        "use_alpha": False,
+        "storage": storage,
+        "correct_aspect": correct_aspect
+    }
+    return apply_noise_params(img, params, cache, band_height)
\ No newline at end of file
@@ -1,5 +1,6 @@
 import math
 import numpy as np
+from . import jit_kernels
 
 # Random Number Generator
 class Random:
@@ -27,18 +28,77 @@ class Random:
     def next(self):
         return self.next_long() / self.m
 
+# Lattice RNG modes: SEQUENTIAL draws the lattice table from one Random stream, so a value
+# depends on every value before it. HASHED derives each lattice value from a stateless
+# hash of (seed, cell_x, cell_y, channel, octave), so any cell costs O(1) on its own.
+SEED_MODES = ('SEQUENTIAL', 'HASHED')
+# Hashed Perlin samplers with more cells than this hash gradients per pixel instead of
+# building a table
+HASH_TABLE_MAX_CELLS = 1 << 22
+
+def _mix32_int(x):
+    """lowbias32 integer finalizer on a Python int"""
+    x &= 0xFFFFFFFF
+    x ^= x >> 16
+    x = (x * 0x7FEB352D) & 0xFFFFFFFF
+    x ^= x >> 15
+    x = (x * 0x846CA68B) & 0xFFFFFFFF
+    x ^= x >> 16
+    return x
+
+def _mix32(x):
+    """lowbias32 integer finalizer on a uint32 array, in place"""
+    x ^= x >> np.uint32(16)
+    x *= np.uint32(0x7FEB352D)
+    x ^= x >> np.uint32(15)
+    x *= np.uint32(0x846CA68B)
+    x ^= x >> np.uint32(16)
+    return x
+
+def lattice_hash(seed, cell_x, cell_y, channel=0, octave=0):
+    """Stateless uint32 hash of lattice cells (vectorized over cell_x, cell_y)"""
+    key = _mix32_int(_mix32_int(_mix32_int(seed) ^ channel) ^ octave)
+    cell_x, cell_y = np.broadcast_arrays(np.asarray(cell_x, dtype=np.int64), np.asarray(cell_y, dtype=np.int64))
+    h = (cell_x & 0xFFFFFFFF).astype(np.uint32)
+    h ^= np.uint32(key)
+    h = _mix32(h)
+    h ^= (cell_y & 0xFFFFFFFF).astype(np.uint32)
+    return _mix32(h)
+
+def hash_unit(h, stream=0):
+    """Uniform float64 in [0, 1) from a lattice hash; streams give independent values per cell"""
+    if stream:
+        h = _mix32(h ^ np.uint32(_mix32_int(stream * 0x9E3779B9)))
+    return h / 4294967296.0
+
 # Perlin Noise Sampler
 class PerlinSampler2D:
-    def __init__(self, width, height, randseed):
+    def __init__(self, width, height, randseed, seed_mode='SEQUENTIAL', channel=0, octave=0):
         self.width = int(width)
         self.height = int(height)
         self.randseed = randseed
-        
+        self.seed_mode = seed_mode
+        self.channel = channel
+        self.octave = octave
+
+        if seed_mode == 'HASHED':
+            # Table only when it is small, the values are the same either way
+            self.gradients = None
+            if self.width * self.height <= HASH_TABLE_MAX_CELLS:
+                cell_y, cell_x = np.divmod(np.arange(self.width * self.height), self.width)
+                self.gradients = self.hashed_gradients(cell_x, cell_y)
+            return
+
         rand = Random()
         rand.set_seed(randseed)
         angles = np.array([rand.next() * math.pi * 2 for _ in range(width * height)])
         self.gradients = np.column_stack([np.sin(angles), np.cos(angles)]).astype(np.float32)
 
+    def hashed_gradients(self, cell_x, cell_y):
+        """Unit gradients (..., 2) of the given (wrapped) cells in HASHED mode"""
+        angles = hash_unit(lattice_hash(self.randseed, cell_x, cell_y, self.channel, self.octave)) * (math.pi * 2)
+        return np.stack([np.sin(angles), np.cos(angles)], axis=-1).astype(np.float32)
+
     # ADD THESE STATIC METHODS
     @staticmethod
     def lerp(a, b, t):
@@ -51,10 +111,36 @@ class PerlinSampler2D:
     def dot(self, cell_x, cell_y, vx, vy):
         cell_x = cell_x % self.width
         cell_y = cell_y % self.height
+        if self.gradients is None:
+            gradients = self.hashed_gradients(cell_x, cell_y)
+            return gradients[..., 0] * vx + gradients[..., 1] * vy
         offsets = cell_x + cell_y * self.width
         return self.gradients[offsets, 0] * vx + self.gradients[offsets, 1] * vy
 
-    def get_value_vectorized(self, x, y):
+    def gradient(self, cell_x, cell_y):
+        """Gradient components (gx, gy) of the given cells"""
+        cell_x = cell_x % self.width
+        cell_y = cell_y % self.height
+        if self.gradients is None:
+            gradients = self.hashed_gradients(cell_x, cell_y)
+            return gradients[..., 0], gradients[..., 1]
+        offsets = cell_x + cell_y * self.width
+        return self.gradients[offsets, 0], self.gradients[offsets, 1]
+
+    def get_value_vectorized(self, x, y, derivatives=False):
+        """Noise at lattice coordinates x, y.
+
+        With derivatives=True returns (value, d/dx, d/dy), the exact partial derivatives of
+        the interpolant in lattice units.
+        """
+        if derivatives:
+            return self._value_and_derivatives(x, y)
+        if jit_kernels.enabled() and np.ndim(x) == 2 and self.gradients is not None:
+            return jit_kernels.perlin_values(
+                np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64),
+                self.gradients, self.width, self.height
+            )
+
         x_floor = np.floor(x).astype(int)
         y_floor = np.floor(y).astype(int)
         x_frac = x - x_floor
@@ -74,14 +160,139 @@ class PerlinSampler2D:
         sy = self.s_curve(y_frac)
         return self.lerp(self.lerp(v00, v10, sx), self.lerp(v01, v11, sx), sy)
 
+    def _value_and_derivatives(self, x, y):
+        x_floor = np.floor(x).astype(int)
+        y_floor = np.floor(y).astype(int)
+        x_frac = x - x_floor
+        y_frac = y - y_floor
+
+        g00x, g00y = self.gradient(x_floor, y_floor)
+        g10x, g10y = self.gradient(x_floor + 1, y_floor)
+        g01x, g01y = self.gradient(x_floor, y_floor + 1)
+        g11x, g11y = self.gradient(x_floor + 1, y_floor + 1)
+        v00 = g00x * x_frac + g00y * y_frac
+        v10 = g10x * (x_frac - 1) + g10y * y_frac
+        v01 = g01x * x_frac + g01y * (y_frac - 1)
+        v11 = g11x * (x_frac - 1) + g11y * (y_frac - 1)
+
+        sx = self.s_curve(x_frac)
+        sy = self.s_curve(y_frac)
+        # s'(t) = 6t(1 - t)
+        dsx = 6 * x_frac * (1 - x_frac)
+        dsy = 6 * y_frac * (1 - y_frac)
+
+        # value = a + sy (b - a), with a and b the lerps along x of the bottom and top corners
+        a = self.lerp(v00, v10, sx)
+        b = self.lerp(v01, v11, sx)
+        da_dx = self.lerp(g00x, g10x, sx) + dsx * (v10 - v00)
+        db_dx = self.lerp(g01x, g11x, sx) + dsx * (v11 - v01)
+        da_dy = self.lerp(g00y, g10y, sx)
+        db_dy = self.lerp(g01y, g11y, sx)
+
+        value = self.lerp(a, b, sy)
+        d_dx = self.lerp(da_dx, db_dx, sy)
+        d_dy = self.lerp(da_dy, db_dy, sy) + dsy * (b - a)
+        return value, d_dx, d_dy
+
+# Several Perlin channels on one lattice
+class PerlinChannels2D:
+    """Perlin samplers of the same lattice size evaluated together.
+
+    Only the gradients differ between channels, so the floor, fractional parts, s-curve
+    weights and lattice offsets are computed once per pixel for all of them. Every
+    channel gets exactly the values of its own sampler.
+    """
+
+    def __init__(self, samplers):
+        self.samplers = samplers
+        self.width = samplers[0].width
+        self.height = samplers[0].height
+        # (channels, cells, 2), or None when a channel hashes its gradients per pixel
+        self.gradients = None
+        if all(sampler.gradients is not None for sampler in samplers):
+            # Move the tables into the stack, each sampler keeps a view of its row, so the
+            # lattice is held once and not per sampler as well
+            self.gradients = np.empty((len(samplers),) + samplers[0].gradients.shape, dtype=np.float32)
+            for k, sampler in enumerate(samplers):
+                self.gradients[k] = sampler.gradients
+                sampler.gradients = self.gradients[k]
+
+    def get_values_vectorized(self, x, y):
+        """Noise of every channel at x, y, stacked on a last axis"""
+        x_floor = np.floor(x).astype(int)
+        y_floor = np.floor(y).astype(int)
+        x_frac = x - x_floor
+        y_frac = y - y_floor
+
+        x0 = x_floor % self.width
+        y0 = y_floor % self.height
+        x1 = (x0 + 1) % self.width
+        y1 = (y0 + 1) % self.height
+        o00 = x0 + y0 * self.width
+        o10 = x1 + y0 * self.width
+        o01 = x0 + y1 * self.width
+        o11 = x1 + y1 * self.width
+        x_frac1 = x_frac - 1
+        y_frac1 = y_frac - 1
+
+        sx = PerlinSampler2D.s_curve(x_frac)
+        sy = PerlinSampler2D.s_curve(y_frac)
+        lerp = PerlinSampler2D.lerp
+
+        values = np.empty(np.shape(x) + (len(self.samplers),))
+        for k, sampler in enumerate(self.samplers):
+            if self.gradients is None:
+                v00 = sampler.dot(x0, y0, x_frac, y_frac)
+                v10 = sampler.dot(x1, y0, x_frac1, y_frac)
+                v01 = sampler.dot(x0, y1, x_frac, y_frac1)
+                v11 = sampler.dot(x1, y1, x_frac1, y_frac1)
+            else:
+                gradients = self.gradients[k]
+                v00 = gradients[o00, 0] * x_frac + gradients[o00, 1] * y_frac
+                v10 = gradients[o10, 0] * x_frac1 + gradients[o10, 1] * y_frac
+                v01 = gradients[o01, 0] * x_frac + gradients[o01, 1] * y_frac1
+                v11 = gradients[o11, 0] * x_frac1 + gradients[o11, 1] * y_frac1
+            values[..., k] = lerp(lerp(v00, v10, sx), lerp(v01, v11, sx), sy)
+        return values
+
 # Voronoii Noise Sampler
+# Cells at least this many pixels wide are evaluated a cell row at a time instead of pixel
+# by pixel; below it the per-row overhead wins. NumPy backend only, the Numba kernel
+# already keeps everything in registers.
+CELL_ENGINE_MIN_PIXELS = 2.0
+
+# Voronoi alpha channel sources. INDEPENDENT is a second field with its own points, the
+# others come from the neighbor search of the main channel at almost no extra cost.
+ALPHA_SOURCES = ('INDEPENDENT', 'F2', 'F2_F1', 'EDGE', 'CELL_ID')
+
+def _edge_distance(ax, ay, bx, by):
+    """Euclidean distance to the bisector of two points, given the pixel - point vectors a and b"""
+    return np.abs(bx * bx + by * by - ax * ax - ay * ay) / (2.0 * np.sqrt((bx - ax) ** 2 + (by - ay) ** 2))
+
 class VoronoiiSampler2D:
-    def __init__(self, width, height, randseed, randomness=1.0):
+    def __init__(self, width, height, randseed, randomness=1.0, seed_mode='SEQUENTIAL', channel=0):
         self.width = int(width)
         self.height = int(height)
         self.randseed = randseed
         self.randomness = randomness
-        self.points = self._generate_random_points()
+        self.seed_mode = seed_mode
+        self.channel = channel
+        if seed_mode == 'HASHED':
+            self.points = self._hashed_points()
+        else:
+            self.points = self._generate_random_points()
+
+    def _hashed_points(self):
+        """Point table of HASHED mode, same placement rules as _generate_random_points"""
+        cell_y, cell_x = np.mgrid[0:self.height, 0:self.width]
+        if self.randomness == 0.0:
+            return np.full((self.height, self.width, 2), 0.5, dtype=np.float32)
+        h = lattice_hash(self.randseed, cell_x, cell_y, self.channel)
+        px = hash_unit(h, 1) * 0.9 + 0.05
+        py = hash_unit(h, 2) * 0.9 + 0.05
+        px = 0.5 + (px - 0.5) * self.randomness
+        py = 0.5 + (py - 0.5) * self.randomness
+        return np.stack([px, py], axis=-1).astype(np.float32)
     
     def _generate_random_points(self):
         """Generate random points grid with improved distribution and randomness control"""
@@ -110,11 +321,105 @@ class VoronoiiSampler2D:
             points.append(row)
         return np.array(points, dtype=np.float32)
     
-    def get_value_vectorized(self, x_coords, y_coords, frequency, return_type=0, return_cell_id=False, smoothness=0.0, minkowski_exponent=3.0):
-        """Fully vectorized Voronoii noise generation with tiling support"""
-        # Convert return_type to integer if it's a string (from enum)
+    @staticmethod
+    def _int_power(values, exponent):
+        """values ** exponent for a positive integer exponent using only multiplications"""
+        result = None
+        while exponent:
+            if exponent & 1:
+                result = values if result is None else result * values
+            exponent >>= 1
+            if exponent:
+                values = values * values
+        return result
+
+    @staticmethod
+    def _metric(return_type, minkowski_exponent):
+        """Name and exponent of the distance metric used by return_type"""
+        if return_type in (4, 5):
+            return 'chebyshev', None
+        p = 2.0 if return_type in (0, 2) else float(minkowski_exponent)
+        if p == 1.0:
+            return 'manhattan', p
+        if p == 2.0:
+            return 'euclidean', p
+        if p.is_integer():
+            return 'integer', p
+        return 'power', p
+
+    @classmethod
+    def _distance_kernel(cls, return_type, minkowski_exponent):
+        """Pick (compare, finish) functions for the metric of return_type.
+
+        compare() is monotone in the true distance and cheap to evaluate on all neighbors,
+        finish() turns the selected F1/F2 back into real distances (e.g. deferred root).
+        """
+        identity = lambda d: d
+        metric, p = cls._metric(return_type, minkowski_exponent)
+        if metric == 'chebyshev':
+            return (lambda dx, dy: np.maximum(np.abs(dx), np.abs(dy))), identity
+        if metric == 'manhattan':
+            return (lambda dx, dy: np.abs(dx) + np.abs(dy)), identity
+        if metric == 'euclidean':
+            # Compared squared
+            return (lambda dx, dy: dx * dx + dy * dy), np.sqrt
+        finish = lambda d: np.power(d, 1.0 / p)
+        if metric == 'integer':
+            exponent = int(p)
+            return (lambda dx, dy: cls._int_power(np.abs(dx), exponent) + cls._int_power(np.abs(dy), exponent)), finish
+        # Generic Minkowski distance with custom exponent
+        return (lambda dx, dy: np.abs(dx)**p + np.abs(dy)**p), finish
+
+    def value_bounds(self, return_type=0, minkowski_exponent=3.0):
+        """Theoretical (min, max) of get_value_vectorized output, in cell units"""
         return_type = int(return_type) if isinstance(return_type, str) else return_type
-        
+        compare, finish = self._distance_kernel(return_type, minkowski_exponent)
+        high = 0.5 + 0.45 * self.randomness
+        if return_type in (0, 1, 4):
+            # The point of the pixel's own cell is at most `high` away on each axis
+            bound = finish(compare(high, high))
+        else:
+            # F2 - F1 <= F2, and the point of the nearer horizontal neighbor is within (0.5 + high, high)
+            bound = finish(compare(0.5 + high, high))
+        return 0.0, float(bound)
+
+    def alpha_bounds(self, alpha_source, return_type=0, minkowski_exponent=3.0):
+        """Theoretical (min, max) of a derived alpha channel (see ALPHA_SOURCES), in cell units"""
+        if alpha_source == 'CELL_ID':
+            return 0.0, 1.0
+        return_type = int(return_type) if isinstance(return_type, str) else return_type
+        compare, finish = self._distance_kernel(return_type, minkowski_exponent)
+        high = 0.5 + 0.45 * self.randomness
+        # F2 bound of value_bounds, F2 - F1 can't exceed it either
+        second = float(finish(compare(0.5 + high, high)))
+        if alpha_source != 'EDGE':
+            return 0.0, second
+        # The bisector is no farther than the midpoint of the two points, (|a| + |b|) / 2 in
+        # Euclidean length. Metrics above p = 2 can pick points up to 2 ** (1/2 - 1/p) longer.
+        metric, p = self._metric(return_type, minkowski_exponent)
+        stretch = math.sqrt(2.0) if metric == 'chebyshev' else 2.0 ** max(0.0, 0.5 - 1.0 / p)
+        return 0.0, stretch * (float(finish(compare(high, high))) + second) / 2.0
+
+    def _features_jit(self, x_coords, y_coords, frequency, return_type, minkowski_exponent, with_edge=False):
+        """F1, F2 (comparison space), F1 cell ids and edge distances (or None) from the fused Numba kernel"""
+        metric, p = self._metric(return_type, minkowski_exponent)
+        metric_codes = {
+            'euclidean': jit_kernels.METRIC_EUCLIDEAN,
+            'manhattan': jit_kernels.METRIC_MANHATTAN,
+            'chebyshev': jit_kernels.METRIC_CHEBYSHEV,
+            'integer': jit_kernels.METRIC_INTEGER,
+            'power': jit_kernels.METRIC_POWER,
+        }
+        grid_size = int(np.ceil(frequency))
+        f1, f2, cell_ids, edge = jit_kernels.voronoi_features(
+            np.asarray(x_coords, dtype=np.float64), np.asarray(y_coords, dtype=np.float64),
+            self.points, 1.0 / frequency, grid_size, grid_size,
+            metric_codes[metric], 0.0 if p is None else p, with_edge
+        )
+        return f1, f2, cell_ids, edge if with_edge else None
+
+    def _features_numpy(self, x_coords, y_coords, frequency, compare, with_edge=False):
+        """F1, F2 (comparison space), F1 cell ids and edge distances (or None) from the vectorized 9-neighbor search"""
         # Get grid shape
         height, width = x_coords.shape
         
@@ -123,62 +428,223 @@ class VoronoiiSampler2D:
         grid_size_x = int(np.ceil(frequency))
         grid_size_y = int(np.ceil(frequency))
         
-        # Expand dimensions for broadcasting
-        x_coords = x_coords.reshape(height, width, 1, 1)
-        y_coords = y_coords.reshape(height, width, 1, 1)
-        
         # Calculate current block coordinates
         block_x = np.floor(x_coords / block_size).astype(int)
         block_y = np.floor(y_coords / block_size).astype(int)
         
-        # Create grid of neighbor offsets (-1, 0, 1) in x and y directions
-        offsets = np.array([[-1, -1], [-1, 0], [-1, 1],
-                           [0, -1], [0, 0], [0, 1],
-                           [1, -1], [1, 0], [1, 1]])
-        offsets_x = offsets[:, 0].reshape(1, 1, 3, 3)
-        offsets_y = offsets[:, 1].reshape(1, 1, 3, 3)
-        
-        # Calculate neighbor block coordinates with tiling
-        neighbor_block_x = (block_x + offsets_x) % grid_size_x
-        neighbor_block_y = (block_y + offsets_y) % grid_size_y
+        # Neighbor offsets (-1, 0, 1) in x and y directions
+        offsets = [(ox, oy) for ox in (-1, 0, 1) for oy in (-1, 0, 1)]
+
+        # Calculate (comparison space) distances from pixel to the points of the neighbor cells
+        flat_distances = np.empty((height, width, 9))
+        for k, (ox, oy) in enumerate(offsets):
+            neighbor_x = block_x + ox
+            neighbor_y = block_y + oy
+            
+            # Get random points from the pre-generated grid (with tiling) and scale them
+            px = self.points[neighbor_y % grid_size_y, neighbor_x % grid_size_x, 0]
+            py = self.points[neighbor_y % grid_size_y, neighbor_x % grid_size_x, 1]
+            px *= block_size
+            py *= block_size
+            
+            # Calculate absolute positions of the random points
+            dx = x_coords - (neighbor_x * block_size + px)
+            dy = y_coords - (neighbor_y * block_size + py)
+            flat_distances[:, :, k] = compare(dx, dy)
         
-        # Get random points from the pre-generated grid
-        # Use broadcasting to get all 9 neighbors for each pixel
-        px = self.points[neighbor_block_y, neighbor_block_x, 0]
-        py = self.points[neighbor_block_y, neighbor_block_x, 1]
+        # Get the indices of the smallest distances
+        indices = np.argpartition(flat_distances, 1, axis=-1)
+        closest_indices = indices[:, :, 0]
         
-        # Scale points to the actual coordinate system
+        # Get the actual closest distances
+        closest_distance0 = np.take_along_axis(flat_distances, closest_indices[:, :, np.newaxis], axis=-1)[:, :, 0]
+        closest_distance1 = np.take_along_axis(flat_distances, indices[:, :, 1][:, :, np.newaxis], axis=-1)[:, :, 0]
+
+        # Unique ID of the closest block (offset index k = (ox + 1) * 3 + (oy + 1))
+        closest_block_x = (block_x + closest_indices // 3 - 1) % grid_size_x
+        closest_block_y = (block_y + closest_indices % 3 - 1) % grid_size_y
+        closest_cell_ids = closest_block_y * grid_size_x + closest_block_x
+
+        edge = None
+        if with_edge:
+            edge = _edge_distance(
+                *self._point_vectors(closest_indices, x_coords, y_coords, block_x, block_y, block_size),
+                *self._point_vectors(indices[:, :, 1], x_coords, y_coords, block_x, block_y, block_size)
+            )
+        return closest_distance0, closest_distance1, closest_cell_ids, edge
+
+    def _point_vectors(self, offset_indices, x_coords, y_coords, block_x, block_y, block_size):
+        """Pixel - point vectors to the points at neighbor offset index (ox + 1) * 3 + (oy + 1)"""
+        grid_size_y, grid_size_x = self.points.shape[:2]
+        neighbor_x = block_x + offset_indices // 3 - 1
+        neighbor_y = block_y + offset_indices % 3 - 1
+        px = self.points[neighbor_y % grid_size_y, neighbor_x % grid_size_x, 0]
+        py = self.points[neighbor_y % grid_size_y, neighbor_x % grid_size_x, 1]
         px *= block_size
         py *= block_size
+        return x_coords - (neighbor_x * block_size + px), y_coords - (neighbor_y * block_size + py)
+
+    def _features_cells(self, width, height, start, stop, frequency, compare, with_edge=False):
+        """F1, F2 (comparison space), F1 cell ids and edge distances (or None) of rows start:stop, one cell row at a time.
+
+        The pixels of a cell row share their neighbor rows, and the neighbor columns of a pixel
+        only depend on its column, so every neighbor offset is one broadcast of a row of
+        points over the cell row: no per-pixel lattice indices or gathers. Same blocks,
+        candidates and arithmetic as _features_numpy, so the result is identical.
+        """
+        block_size = 1.0 / frequency
+        grid_size_x = int(np.ceil(frequency))
+        grid_size_y = int(np.ceil(frequency))
+        x_coords = np.arange(width) / width
+        y_coords = np.arange(start, stop) / height
+        block_x = np.floor(x_coords / block_size).astype(int)
+        block_y = np.floor(y_coords / block_size).astype(int)
+
+        f1 = np.empty((stop - start, width))
+        f2 = np.empty((stop - start, width))
+        cell_ids = np.empty((stop - start, width), dtype=np.int64)
+        edge = np.empty((stop - start, width)) if with_edge else None
+        # Rows of one block are contiguous, block_y never decreases
+        row_starts = np.flatnonzero(np.diff(block_y, prepend=block_y[0] - 1))
+        for first, last in zip(row_starts, list(row_starts[1:]) + [stop - start]):
+            rows_y = y_coords[first:last, np.newaxis]
+            best0 = np.full((last - first, width), np.inf)
+            best1 = np.full((last - first, width), np.inf)
+            best_ids = np.zeros((last - first, width), dtype=np.int64)
+            # Candidate point positions per column and the indices of F1 and F2 among them
+            candidates_x, candidates_y = [], []
+            best_k0 = best_k1 = np.int8(0)
+            for ox in (-1, 0, 1):
+                neighbor_x = block_x + ox
+                cell_x = neighbor_x % grid_size_x
+                for oy in (-1, 0, 1):
+                    neighbor_y = block_y[first] + oy
+                    cell_y = neighbor_y % grid_size_y
+                    px = self.points[cell_y, cell_x, 0]
+                    py = self.points[cell_y, cell_x, 1]
+                    px *= block_size
+                    py *= block_size
+
+                    point_x = neighbor_x * block_size + px
+                    point_y = neighbor_y * block_size + py
+                    distances = compare(x_coords - point_x, rows_y - point_y)
+                    closer = distances < best0
+                    if with_edge:
+                        k = np.int8(len(candidates_x))
+                        candidates_x.append(point_x)
+                        candidates_y.append(np.broadcast_to(point_y, point_x.shape))
+                        best_k1 = np.where(closer, best_k0, np.where(distances < best1, k, best_k1))
+                        best_k0 = np.where(closer, k, best_k0)
+                    best1 = np.where(closer, best0, np.minimum(best1, distances))
+                    best0 = np.where(closer, distances, best0)
+                    best_ids = np.where(closer, cell_y * grid_size_x + cell_x, best_ids)
+            f1[first:last] = best0
+            f2[first:last] = best1
+            cell_ids[first:last] = best_ids
+            if with_edge:
+                candidates_x = np.stack(candidates_x)
+                candidates_y = np.stack(candidates_y)
+                columns = np.arange(width)
+                edge[first:last] = _edge_distance(
+                    x_coords - candidates_x[best_k0, columns], rows_y - candidates_y[best_k0, columns],
+                    x_coords - candidates_x[best_k1, columns], rows_y - candidates_y[best_k1, columns]
+                )
+        return f1, f2, cell_ids, edge
+
+    def smooth(self, noise, smoothness, frequency):
+        """Box blur with wrap-around borders, so smoothed noise still tiles"""
+        # Use a simple box blur implemented with numpy to avoid scipy dependency
+        # Calculate base kernel size based on smoothness (convert 0-1 to kernel size)
+        base_kernel_size = max(3, int(smoothness * 40))  # 3-41 kernel size
         
-        # Calculate absolute positions of the random points
-        point_x = (block_x + offsets_x) * block_size + px
-        point_y = (block_y + offsets_y) * block_size + py
+        # Adjust blur radius based on frequency: blur_radius = current_radius * 3 / frequency
+        # Convert this to kernel size adjustment
+        frequency_factor = max(0.1, 3.0 / frequency)
+        adjusted_kernel_size = max(3, int(base_kernel_size * frequency_factor))
         
-        # Calculate distances from pixel to all points
-        dx = x_coords - point_x
-        dy = y_coords - point_y
+        # Ensure odd kernel size for symmetry
+        if adjusted_kernel_size % 2 == 0:
+            adjusted_kernel_size += 1
         
-        if return_type == 0 or return_type == 2:
-            # Euclidean distance
-            distances = np.sqrt(dx**2 + dy**2)
-        else:
-            # Minkowski distance with custom exponent
-            distances = np.power(np.abs(dx)**minkowski_exponent + np.abs(dy)**minkowski_exponent, 1.0 / minkowski_exponent)
+        kernel = np.ones((adjusted_kernel_size, adjusted_kernel_size)) / (adjusted_kernel_size * adjusted_kernel_size)
         
-        # Find closest distances and their indices
-        flat_distances = distances.reshape(height, width, 9)
+        # Apply convolution with periodic boundary conditions for seamless tiling
+        pad_size = adjusted_kernel_size // 2
         
-        # Get the indices of the smallest distances
-        indices = np.argpartition(flat_distances, 1, axis=-1)
-        closest_indices = indices[:, :, 0]
+        # Pad the noise array with periodic boundary conditions (tile the image)
+        padded_noise = np.pad(noise, pad_width=pad_size, mode='wrap')
         
-        # Get the actual closest distances
-        closest_distance0 = np.take_along_axis(flat_distances, closest_indices[:, :, np.newaxis], axis=-1)[:, :, 0]
-        closest_distance1 = np.take_along_axis(flat_distances, indices[:, :, 1][:, :, np.newaxis], axis=-1)[:, :, 0]
+        # Apply horizontal convolution
+        padded_result = np.apply_along_axis(
+            lambda x: np.convolve(x, kernel[0], mode='valid'),
+            axis=1, arr=padded_noise
+        )
+        
+        # Apply vertical convolution
+        noise = np.apply_along_axis(
+            lambda x: np.convolve(x, kernel[:, 0], mode='valid'),
+            axis=0, arr=padded_result
+        )
+        return noise
+
+    def get_value_vectorized(self, x_coords, y_coords, frequency, return_type=0, return_cell_id=False, smoothness=0.0, minkowski_exponent=3.0, alpha_source=None):
+        """Fully vectorized Voronoii noise generation with tiling support.
+
+        With an alpha_source other than INDEPENDENT, the derived alpha values are returned last.
+        """
+        # Convert return_type to integer if it's a string (from enum)
+        return_type = int(return_type) if isinstance(return_type, str) else return_type
+        compare, finish = self._distance_kernel(return_type, minkowski_exponent)
+        with_edge = alpha_source == 'EDGE'
+
+        if jit_kernels.enabled():
+            features = self._features_jit(x_coords, y_coords, frequency, return_type, minkowski_exponent, with_edge)
+        else:
+            features = self._features_numpy(x_coords, y_coords, frequency, compare, with_edge)
+        return self._noise_from_features(features, frequency, return_type, finish, return_cell_id, smoothness, alpha_source)
+
+    def get_value_grid(self, width, height, start, stop, frequency, return_type=0, return_cell_id=False, minkowski_exponent=3.0, alpha_source=None):
+        """get_value_vectorized over rows start:stop of a width x height image (coordinates j / width, i / height).
+
+        Without Numba, images whose cells are at least CELL_ENGINE_MIN_PIXELS pixels wide are
+        evaluated one cell row at a time (see _features_cells).
+        """
+        return_type = int(return_type) if isinstance(return_type, str) else return_type
+        if not jit_kernels.enabled() and min(width, height) / frequency >= CELL_ENGINE_MIN_PIXELS:
+            compare, finish = self._distance_kernel(return_type, minkowski_exponent)
+            features = self._features_cells(width, height, start, stop, frequency, compare, alpha_source == 'EDGE')
+            return self._noise_from_features(features, frequency, return_type, finish, return_cell_id, alpha_source=alpha_source)
+
+        j, i = np.meshgrid(np.arange(width), np.arange(start, stop))
+        return self.get_value_vectorized(
+            j / width, i / height, frequency, return_type,
+            return_cell_id=return_cell_id, minkowski_exponent=minkowski_exponent, alpha_source=alpha_source
+        )
+
+    def _alpha_from_features(self, distance0, distance1, cell_ids, edge, block_size, alpha_source):
+        """Derived alpha channel (see ALPHA_SOURCES) from finished F1/F2 distances, cell ids and edge distances"""
+        if alpha_source == 'CELL_ID':
+            # A value per cell, independent of the point positions (hash stream 3)
+            cell_y, cell_x = np.divmod(cell_ids, self.width)
+            return hash_unit(lattice_hash(self.randseed, cell_x, cell_y, self.channel), 3)
+        if alpha_source == 'F2':
+            return distance1 / block_size
+        if alpha_source == 'F2_F1':
+            return (distance1 - distance0) / block_size
+        return edge / block_size
+
+    def _noise_from_features(self, features, frequency, return_type, finish, return_cell_id=False, smoothness=0.0, alpha_source=None):
+        block_size = 1.0 / frequency
+        closest_distance0, closest_distance1, closest_cell_ids, edge = features
+        closest_distance0 = finish(closest_distance0)
+        closest_distance1 = finish(closest_distance1)
+        alpha = None
+        if alpha_source and alpha_source != 'INDEPENDENT':
+            # Before the noise is scaled in place below
+            alpha = self._alpha_from_features(closest_distance0, closest_distance1, closest_cell_ids, edge, block_size, alpha_source)
         
         # Calculate noise value based on return type
-        if return_type == 0 or return_type == 1:
+        if return_type in (0, 1, 4):
             noise = closest_distance0
         else:
             noise = closest_distance1 - closest_distance0
@@ -188,47 +654,12 @@ class VoronoiiSampler2D:
         
         # Apply smoothing if needed
         if smoothness > 0.0:
-            # Use a simple box blur implemented with numpy to avoid scipy dependency
-            # Calculate base kernel size based on smoothness (convert 0-1 to kernel size)
-            base_kernel_size = max(3, int(smoothness * 40))  # 3-41 kernel size
-            
-            # Adjust blur radius based on frequency: blur_radius = current_radius * 3 / frequency
-            # Convert this to kernel size adjustment
-            frequency_factor = max(0.1, 3.0 / frequency)
-            adjusted_kernel_size = max(3, int(base_kernel_size * frequency_factor))
-            
-            # Ensure odd kernel size for symmetry
-            if adjusted_kernel_size % 2 == 0:
-                adjusted_kernel_size += 1
-            
-            kernel = np.ones((adjusted_kernel_size, adjusted_kernel_size)) / (adjusted_kernel_size * adjusted_kernel_size)
-            
-            # Apply convolution with periodic boundary conditions for seamless tiling
-            pad_size = adjusted_kernel_size // 2
-            
-            # Pad the noise array with periodic boundary conditions (tile the image)
-            padded_noise = np.pad(noise, pad_width=pad_size, mode='wrap')
-            
-            # Apply horizontal convolution
-            padded_result = np.apply_along_axis(
-                lambda x: np.convolve(x, kernel[0], mode='valid'),
-                axis=1, arr=padded_noise
-            )
-            
-            # Apply vertical convolution
-            noise = np.apply_along_axis(
-                lambda x: np.convolve(x, kernel[:, 0], mode='valid'),
-                axis=0, arr=padded_result
-            )
+            noise = self.smooth(noise, smoothness, frequency)
         
+        if alpha is not None:
+            return (noise, closest_cell_ids, alpha) if return_cell_id else (noise, alpha)
+
         if return_cell_id:
-            # Calculate unique cell IDs for each block
-            block_ids = neighbor_block_y * grid_size_x + neighbor_block_x
-            block_ids = block_ids.reshape(height, width, 9)
-            
-            # Get the ID of the closest block
-            closest_cell_ids = np.take_along_axis(block_ids, closest_indices[:, :, np.newaxis], axis=-1)[:, :, 0]
-            
             return noise, closest_cell_ids
         
         return noise
\ No newline at end of file
@@ -1,7 +1,80 @@
 import bpy
 from bpy.types import Operator
 from bpy.props import IntProperty, FloatProperty, BoolProperty, StringProperty, EnumProperty
-from .noise_generators import create_perlin_noise_image, create_turbulence_image, create_voronoii_noise_image
+
+# The generators and the cache pull in NumPy (and optionally Numba). They are imported
+# inside execute() so that enabling the add-on or starting Blender doesn't pay for it.
+
+
+def texture_cache(scene):
+    """Disk cache configured on the scene, or None when caching is off"""
+    if not scene.noise_cache_enabled:
+        return None
+    from .cache import TextureCache
+    from .noise_generators import GENERATOR_VERSION
+    return TextureCache(
+        bpy.path.abspath(scene.noise_cache_dir),
+        scene.noise_cache_size * 1024 * 1024,
+        GENERATOR_VERSION
+    )
+
+def generation_cache(scene):
+    """Cache used by the generate operators: in memory first when recipe undo is on"""
+    if scene.noise_recipe_undo:
+        from .recipe_undo import memory_cache
+        return memory_cache(scene)
+    return texture_cache(scene)
+
+def plan_bands(operator, scene, params):
+    """Band height that keeps generating params inside the scene's memory budget.
+
+    Returns None after reporting an error when even the smallest band doesn't fit.
+    """
+    from . import jit_kernels
+    from .memory import choose_band_height, estimate_peak_bytes, MIN_BAND_ROWS
+
+    budget = scene.noise_memory_budget * 1024 * 1024
+    jit = jit_kernels.enabled()
+    band_height = choose_band_height(params, budget, jit)
+    if band_height is None:
+        needed = estimate_peak_bytes(params, MIN_BAND_ROWS, jit)
+        operator.report({'ERROR'}, f"Needs about {needed // (1024 * 1024)} MB, memory budget is {scene.noise_memory_budget} MB")
+    return band_height
+
+def params_from_scene(scene, width=None, height=None):
+    """noise_params for the panel settings, at another size if width and height are given"""
+    from .noise_generators import perlin_params, spectral_params, turbulence_params, voronoii_params
+
+    width = width or scene.noise_width
+    height = height or scene.noise_height
+    if scene.noise_type == 'VORONOII':
+        return voronoii_params(
+            width, height, scene.noise_frequency, scene.noise_seed,
+            scene.noise_return_type, scene.noise_use_color, scene.noise_use_alpha, scene.noise_correct_aspect,
+            scene.noise_smoothness, scene.noise_randomness, scene.noise_minkowski_exponent,
+            scene.noise_normalization, scene.noise_storage, scene.noise_seed_mode, scene.noise_alpha_source
+        )
+    if scene.noise_engine == 'SPECTRAL':
+        return spectral_params(
+            width, height, scene.noise_period, scene.noise_seed,
+            scene.noise_depth if scene.noise_turbulence else 0, scene.noise_lacunarity, scene.noise_atten,
+            scene.noise_use_color, scene.noise_use_alpha, scene.noise_absolute, scene.noise_correct_aspect,
+            scene.noise_storage
+        )
+    if scene.noise_turbulence:
+        return turbulence_params(
+            width, height, scene.noise_period, scene.noise_seed,
+            scene.noise_depth, scene.noise_lacunarity, scene.noise_atten,
+            scene.noise_use_color, scene.noise_use_alpha, scene.noise_absolute, scene.noise_correct_aspect,
+            scene.noise_band_limited, scene.noise_storage, scene.noise_seed_mode,
+            scene.noise_derivative_output, scene.noise_normal_strength
+        )
+    return perlin_params(
+        width, height, scene.noise_period, scene.noise_seed,
+        scene.noise_use_color, scene.noise_use_alpha, scene.noise_absolute, scene.noise_correct_aspect,
+        scene.noise_storage, scene.noise_seed_mode,
+        scene.noise_derivative_output, scene.noise_normal_strength
+    )
 
 class NOISE_OT_generate_perlin(Operator):
     bl_idname = "noise.generate_perlin"
@@ -59,11 +132,66 @@ class NOISE_OT_generate_perlin(Operator):
         default=False,
         description="Enable multi-layer turbulence"
     )
+    engine: EnumProperty(
+        name="Engine",
+        items=[
+            ('LATTICE', "Lattice", "Perlin noise, one lattice per layer (tiles when Scale divides the image size)"),
+            ('SPECTRAL', "Spectral", "Fractal noise synthesized with an FFT: tiles at any size, cost independent of depth"),
+        ],
+        default='LATTICE',
+        description="How the noise is computed"
+    )
+    band_limited: BoolProperty(
+        name="Band Limited",
+        default=False,
+        description="Skip octaves finer than 2 pixels and fade out those close to it (faster, less aliasing)"
+    )
+    derivative_output: EnumProperty(
+        name="Output",
+        items=[
+            ('NONE', "Height", "Noise values"),
+            ('NORMAL', "Normal Map", "Tangent space normal map from the analytic slopes of the noise, height in alpha"),
+            ('FLOW', "Flow Map", "Flow along the contour lines of the noise in RG, height in alpha"),
+        ],
+        default='NONE',
+        description="What is written to the image"
+    )
+    normal_strength: FloatProperty(
+        name="Strength",
+        default=1.0,
+        min=0.0,
+        max=100.0,
+        description="Slope multiplier of normal and flow maps"
+    )
     correct_aspect: BoolProperty(
         name="Correct Aspect Ratio",
         default=True,
         description="Adjust display aspect ratio based on image dimensions"
     )
+    storage: EnumProperty(
+        name="Storage",
+        items=[
+            ('BYTE', "8 bit", "Byte image, smallest in memory and in the .blend"),
+            ('HALF', "Half Float", "16 bit float image"),
+            ('FLOAT', "Float", "32 bit float image"),
+        ],
+        default='BYTE',
+        description="Pixel format of the generated image"
+    )
+    procedural: BoolProperty(
+        name="Procedural",
+        default=False,
+        description="Save only the noise settings in the .blend and regenerate the pixels when needed"
+    )
+    seed_mode: EnumProperty(
+        name="Seed Mode",
+        items=[
+            ('SEQUENTIAL', "Sequential", "Lattice values drawn in order from one random stream (original look)"),
+            ('HASHED', "Hashed", "Every lattice value hashed from its cell, channel and octave (no tables, any part can be generated alone)"),
+        ],
+        default='SEQUENTIAL',
+        description="How random lattice values are derived from the seed"
+    )
 
     width: IntProperty(default=512, min=64, max=8192)
     height: IntProperty(default=512, min=64, max=8192)
@@ -71,10 +199,54 @@ class NOISE_OT_generate_perlin(Operator):
     seed: IntProperty(default=1, min=0)
 
     def execute(self, context):
+        from .noise_generators import create_perlin_noise_image, create_turbulence_image, create_spectral_image
+        from .noise_generators import perlin_params, spectral_params, turbulence_params
+        from .procedural import mark_procedural
+        from .recipe_undo import track
+
         if not self.overwrite and self.image_name in bpy.data.images:
             self.report({'ERROR'}, "Image exists! Check Overwrite")
             return {'CANCELLED'}
-        if self.turbulence:
+        # Same params as the create_* call below builds, for the memory estimate
+        if self.engine == 'SPECTRAL':
+            params = spectral_params(
+                self.width, self.height, self.period, self.seed,
+                self.depth if self.turbulence else 0, self.lacunarity, self.atten,
+                self.use_color, self.use_alpha, self.absolute, self.correct_aspect, self.storage
+            )
+        elif self.turbulence:
+            params = turbulence_params(
+                self.width, self.height, self.period, self.seed, self.depth, self.lacunarity, self.atten,
+                self.use_color, self.use_alpha, self.absolute, self.correct_aspect, self.band_limited,
+                self.storage, self.seed_mode, self.derivative_output, self.normal_strength
+            )
+        else:
+            params = perlin_params(
+                self.width, self.height, self.period, self.seed, self.use_color, self.use_alpha, self.absolute,
+                self.correct_aspect, self.storage, self.seed_mode, self.derivative_output, self.normal_strength
+            )
+        band_height = plan_bands(self, context.scene, params)
+        if band_height is None:
+            return {'CANCELLED'}
+        if self.engine == 'SPECTRAL':
+            image = create_spectral_image(
+                self.image_name,
+                self.width,
+                self.height,
+                self.period,
+                self.seed,
+                self.depth if self.turbulence else 0,
+                self.lacunarity,
+                self.atten,
+                self.use_color,
+                self.use_alpha,
+                self.absolute,
+                self.overwrite,
+                self.correct_aspect,
+                storage=self.storage,
+                cache=generation_cache(context.scene)
+            )
+        elif self.turbulence:
             image = create_turbulence_image(
                 self.image_name,
                 self.width,
@@ -88,7 +260,14 @@ class NOISE_OT_generate_perlin(Operator):
                 self.use_alpha,
                 self.absolute,
                 self.overwrite,
-                self.correct_aspect
+                self.correct_aspect,
+                band_limited=self.band_limited,
+                storage=self.storage,
+                seed_mode=self.seed_mode,
+                derivative_output=self.derivative_output,
+                normal_strength=self.normal_strength,
+                cache=generation_cache(context.scene),
+                band_height=band_height
             )
         else:
             image = create_perlin_noise_image(
@@ -101,18 +280,30 @@ class NOISE_OT_generate_perlin(Operator):
                 self.correct_aspect,
                 self.use_color,
                 self.use_alpha,
-                self.absolute
+                self.absolute,
+                storage=self.storage,
+                seed_mode=self.seed_mode,
+                derivative_output=self.derivative_output,
+                normal_strength=self.normal_strength,
+                cache=generation_cache(context.scene),
+                band_height=band_height
             )
         
         # Set the active image in the Image Editor
         if context.space_data and context.space_data.type == 'IMAGE_EDITOR':
             context.space_data.image = image
         
-        self.report({'INFO'}, f"Image updated: {image.name}")
+        if self.turbulence and self.engine == 'LATTICE':
+            self.report({'INFO'}, f"Image updated: {image.name} ({image['noise_octaves_evaluated']} of {self.depth + 1} octaves evaluated)")
+        else:
+            self.report({'INFO'}, f"Image updated: {image.name}")
         context.scene.noise_generator_last_image = image.name
         context.scene.noise_image_name = image.name
         context.scene.noise_overwrite = True
-        image.pack()
+        # Recipe undo relies on undo steps holding params only, so the pixels aren't packed
+        image = mark_procedural(image, self.procedural or context.scene.noise_recipe_undo)
+        if context.scene.noise_recipe_undo:
+            track(image)
         image.colorspace_settings.name = 'Non-Color'
         return {'FINISHED'}
 
@@ -146,6 +337,8 @@ class NOISE_OT_generate_voronoii(Operator):
             ('1', "Minkowski Distance", "Distance to the closest point using Minkowski distance"),
             ('2', "Cell Pattern (Euclidean)", "Difference between closest and second closest point using Euclidean distance"),
             ('3', "Cell Pattern (Minkowski)", "Difference between closest and second closest point using Minkowski distance"),
+            ('4', "Chebyshev Distance", "Distance to the closest point using Chebyshev distance"),
+            ('5', "Cell Pattern (Chebyshev)", "Difference between closest and second closest point using Chebyshev distance"),
         ],
         default='0',
         description="Type of distance calculation for Voronoii noise"
@@ -157,6 +350,16 @@ class NOISE_OT_generate_voronoii(Operator):
         max=10.0,
         description="Exponent for Minkowski distance calculation"
     )
+    normalization: EnumProperty(
+        name="Normalization",
+        items=[
+            ('GLOBAL', "Global", "Stretch the min/max of the whole image to 0-1"),
+            ('CHANNEL', "Per Channel", "Stretch the min/max of every channel to 0-1"),
+            ('ANALYTIC', "Analytic", "Use theoretical bounds of the noise, no pass over the image (tile independent)"),
+        ],
+        default='GLOBAL',
+        description="How noise values are mapped to the 0-1 range"
+    )
     use_color: BoolProperty(
         name="RGB",
         default=False,
@@ -167,6 +370,18 @@ class NOISE_OT_generate_voronoii(Operator):
         default=False,
         description="Generate alpha channel noise"
     )
+    alpha_source: EnumProperty(
+        name="Alpha Source",
+        items=[
+            ('INDEPENDENT', "Independent", "A second Voronoi field with its own points (original look, costs a second search)"),
+            ('F2', "F2", "Distance to the second closest point"),
+            ('F2_F1', "F2 - F1", "Difference between the second closest and the closest point distances"),
+            ('EDGE', "Edge Distance", "Distance to the edge between the closest and the second closest point"),
+            ('CELL_ID', "Cell Value", "A random value per cell"),
+        ],
+        default='INDEPENDENT',
+        description="What the alpha channel shows; all but Independent come from the same search as the noise"
+    )
     correct_aspect: BoolProperty(
         name="Correct Aspect Ratio",
         default=True,
@@ -186,15 +401,51 @@ class NOISE_OT_generate_voronoii(Operator):
         max=1.0,
         description="Randomness of cell center positions (0 = grid, 1 = fully random)"
     )
+    storage: EnumProperty(
+        name="Storage",
+        items=[
+            ('BYTE', "8 bit", "Byte image, smallest in memory and in the .blend"),
+            ('HALF', "Half Float", "16 bit float image"),
+            ('FLOAT', "Float", "32 bit float image"),
+        ],
+        default='BYTE',
+        description="Pixel format of the generated image"
+    )
+    procedural: BoolProperty(
+        name="Procedural",
+        default=False,
+        description="Save only the noise settings in the .blend and regenerate the pixels when needed"
+    )
+    seed_mode: EnumProperty(
+        name="Seed Mode",
+        items=[
+            ('SEQUENTIAL', "Sequential", "Lattice values drawn in order from one random stream (original look)"),
+            ('HASHED', "Hashed", "Every lattice value hashed from its cell, channel and octave (no tables, any part can be generated alone)"),
+        ],
+        default='SEQUENTIAL',
+        description="How random lattice values are derived from the seed"
+    )
 
     width: IntProperty(default=512, min=64, max=8192)
     height: IntProperty(default=512, min=64, max=8192)
     seed: IntProperty(default=1, min=0)
 
     def execute(self, context):
+        from .noise_generators import create_voronoii_noise_image, voronoii_params
+        from .procedural import mark_procedural
+        from .recipe_undo import track
+
         if not self.overwrite and self.image_name in bpy.data.images:
             self.report({'ERROR'}, "Image exists! Check Overwrite")
             return {'CANCELLED'}
+        params = voronoii_params(
+            self.width, self.height, self.frequency, self.seed, self.return_type,
+            self.use_color, self.use_alpha, self.correct_aspect, self.smoothness, self.randomness,
+            self.minkowski_exponent, self.normalization, self.storage, self.seed_mode, self.alpha_source
+        )
+        band_height = plan_bands(self, context.scene, params)
+        if band_height is None:
+            return {'CANCELLED'}
         
         image = create_voronoii_noise_image(
             self.image_name,
@@ -209,7 +460,13 @@ class NOISE_OT_generate_voronoii(Operator):
             self.correct_aspect,
             smoothness=self.smoothness,
             randomness=self.randomness,
-            minkowski_exponent=self.minkowski_exponent
+            minkowski_exponent=self.minkowski_exponent,
+            normalization=self.normalization,
+            storage=self.storage,
+            seed_mode=self.seed_mode,
+            alpha_source=self.alpha_source,
+            cache=generation_cache(context.scene),
+            band_height=band_height
         )
         
         # Set the active image in the Image Editor
@@ -220,10 +477,297 @@ class NOISE_OT_generate_voronoii(Operator):
         context.scene.noise_generator_last_image = image.name
         context.scene.noise_image_name = image.name
         context.scene.noise_overwrite = True
-        image.pack()
+        # Recipe undo relies on undo steps holding params only, so the pixels aren't packed
+        image = mark_procedural(image, self.procedural or context.scene.noise_recipe_undo)
+        if context.scene.noise_recipe_undo:
+            track(image)
         image.colorspace_settings.name = 'Non-Color'
         return {'FINISHED'}
 
+# Operator to Queue a Generation from the Panel Settings
+class NOISE_OT_queue_generate(Operator):
+    bl_idname = "noise.queue_generate"
+    bl_label = "Queue"
+    bl_description = "Generate an image from the panel settings in the background; results are applied in queue order"
+
+    def execute(self, context):
+        from .jobs import get_job_queue
+        from .noise_generators import finish_image, get_image
+        from .procedural import band_height_for, mark_procedural
+
+        scene = context.scene
+        name = scene.noise_image_name
+        overwrite = scene.noise_overwrite
+        if not overwrite and name in bpy.data.images:
+            self.report({'ERROR'}, "Image exists! Check Overwrite")
+            return {'CANCELLED'}
+
+        params = params_from_scene(scene)
+        procedural = scene.noise_procedural or scene.noise_recipe_undo
+
+        def apply(raster):
+            image = get_image(name, params["width"], params["height"], overwrite, params["storage"])
+            finish_image(image, raster, params)
+            image = mark_procedural(image, procedural)
+            image.colorspace_settings.name = 'Non-Color'
+            scene.noise_generator_last_image = image.name
+
+        queue = get_job_queue(scene.noise_job_workers)
+        # Every worker may run a job at the same time, each gets a share of the memory budget
+        queue.submit(name, params, apply, texture_cache(scene), band_height_for(scene, params, queue.workers))
+        self.report({'INFO'}, f"Queued {name}")
+        return {'FINISHED'}
+
+# Operator to Animate a Noise Image
+class NOISE_OT_add_animation_track(Operator):
+    bl_idname = "noise.add_animation_track"
+    bl_label = "Animate Image"
+    bl_description = "Add a track with keyframable seed, scale and frequency for the image shown in the Image Editor"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        from .animation import tracked_image
+        from .procedural import mark_procedural
+
+        scene = context.scene
+        image = None
+        if context.space_data and context.space_data.type == 'IMAGE_EDITOR':
+            image = context.space_data.image
+        image = image or bpy.data.images.get(scene.noise_generator_last_image)
+        if not image:
+            self.report({'ERROR'}, "No image to animate")
+            return {'CANCELLED'}
+        if any(track.image_name == image.name for track in scene.noise_anim_tracks):
+            self.report({'ERROR'}, f"{image.name} is animated already")
+            return {'CANCELLED'}
+
+        track = scene.noise_anim_tracks.add()
+        track.image_name = image.name
+        if tracked_image(track) is None:
+            scene.noise_anim_tracks.remove(len(scene.noise_anim_tracks) - 1)
+            self.report({'ERROR'}, "Only generated Perlin, spectral and Voronoi images can be animated")
+            return {'CANCELLED'}
+        params = image["noise_params"]
+        track.seed = params["seed"]
+        track.period = params.get("period", track.period)
+        track.frequency = params.get("frequency", track.frequency)
+        # The pixels follow the frame, packing those of one frame would only bloat the .blend
+        image = mark_procedural(image, True)
+        self.report({'INFO'}, f"Animating {image.name}, keyframe its track settings")
+        return {'FINISHED'}
+
+# Operator to Stop Animating a Noise Image
+class NOISE_OT_remove_animation_track(Operator):
+    bl_idname = "noise.remove_animation_track"
+    bl_label = "Remove Track"
+    bl_description = "Stop animating the image and delete the keyframes of its track"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    index: IntProperty(default=0, min=0)
+
+    def execute(self, context):
+        from .animation import remove_track
+
+        if self.index >= len(context.scene.noise_anim_tracks):
+            return {'CANCELLED'}
+        remove_track(context.scene, self.index)
+        return {'FINISHED'}
+
+# Operator to Pre-bake Animated Noise
+class NOISE_OT_bake_animation(Operator):
+    bl_idname = "noise.bake_animation"
+    bl_label = "Bake Frames"
+    bl_description = "Generate the animated images for every frame of the scene in the background, filling the frame cache ahead of a render"
+
+    def execute(self, context):
+        from .animation import frame_cache, frame_params, track_values_at, tracked_image
+        from .cache import cache_key
+        from .jobs import get_job_queue
+        from .memory import RASTER_CHANNEL_BYTES, num_channels
+        from .noise_generators import GENERATOR_VERSION
+        from .procedural import band_height_for
+
+        scene = context.scene
+        cache = frame_cache(scene)
+        queue = get_job_queue(scene.noise_job_workers)
+        queued = set()
+        needed = 0
+        for index, track in enumerate(scene.noise_anim_tracks):
+            img = tracked_image(track) if track.enabled else None
+            if img is None:
+                continue
+            base = img["noise_params"].to_dict()
+            for frame in range(scene.frame_start, scene.frame_end + 1, scene.frame_step):
+                params = frame_params(base, track_values_at(scene, index, frame))
+                key = cache_key(params, GENERATOR_VERSION)
+                # Frames with the same settings (e.g. held keyframes) are generated once
+                if key in queued:
+                    continue
+                queued.add(key)
+                needed += params["width"] * params["height"] * RASTER_CHANNEL_BYTES[params.get("storage", 'BYTE')] * num_channels(params["use_color"], params["use_alpha"])
+                # Nothing to apply, load_or_generate stores the frame in the cache
+                queue.submit(
+                    f"{track.image_name} frame {frame}", params, lambda raster: None, cache,
+                    band_height_for(scene, params, queue.workers)
+                )
+        if not queued:
+            self.report({'ERROR'}, "No animated noise images")
+            return {'CANCELLED'}
+        if needed > cache.max_bytes and cache.backing is None:
+            self.report({'WARNING'}, f"{len(queued)} frames need {needed // (1024 * 1024)} MB, the frame cache holds "
+                                     f"{scene.noise_anim_cache_size} MB: enable the disk cache to keep them all")
+        else:
+            self.report({'INFO'}, f"Baking {len(queued)} frames")
+        return {'FINISHED'}
+
+# Operator to Clear Finished Jobs
+class NOISE_OT_clear_jobs(Operator):
+    bl_idname = "noise.clear_jobs"
+    bl_label = "Clear Finished"
+    bl_description = "Remove finished jobs from the list"
+
+    def execute(self, context):
+        from .jobs import get_job_queue
+
+        get_job_queue(context.scene.noise_job_workers).clear_finished()
+        return {'FINISHED'}
+
+# Operator to Clear the Texture Cache
+class NOISE_OT_clear_cache(Operator):
+    bl_idname = "noise.clear_cache"
+    bl_label = "Clear Cache"
+    bl_description = "Delete all cached noise textures from the cache directory"
+
+    def execute(self, context):
+        from .cache import TextureCache
+        from .noise_generators import GENERATOR_VERSION
+
+        TextureCache(bpy.path.abspath(context.scene.noise_cache_dir), 0, GENERATOR_VERSION).clear()
+        self.report({'INFO'}, "Noise cache cleared")
+        return {'FINISHED'}
+
+# Progress line of the running export batch, shown in the panel
+export_status = ""
+
+def _poll_export_queue():
+    """Timer: refresh the export status until the queue is idle"""
+    global export_status
+    from .export import get_export_queue
+
+    queue = get_export_queue(bpy.context.scene.noise_export_workers)
+    finished, total, failed, throughput = queue.summary()
+    export_status = f"Exported {finished}/{total} ({throughput:.1f} MB/s)"
+    if failed:
+        export_status += f", {failed} failed"
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'IMAGE_EDITOR':
+                area.tag_redraw()
+    if queue.idle():
+        for job in queue.jobs:
+            if job.error:
+                print(f"Noise export failed for {job.path}: {job.error}")
+        return None
+    return 0.25
+
+# Operator to Export Textures
+class NOISE_OT_export(Operator):
+    bl_idname = "noise.export"
+    bl_label = "Export Textures"
+    bl_description = "Write noise textures to disk in the background, without packing them"
+
+    source: EnumProperty(
+        name="Source",
+        items=[
+            ('ACTIVE', "Active Image", "Export the pixels of the image shown in the Image Editor"),
+            ('ALL', "All Noise Images", "Regenerate every noise image from its parameters and export it"),
+        ],
+        default='ACTIVE'
+    )
+
+    def execute(self, context):
+        import numpy as np
+        from .export import get_export_queue
+        from .procedural import band_height_for, regenerate_now
+
+        scene = context.scene
+        directory = bpy.path.abspath(scene.noise_export_dir)
+        queue = get_export_queue(scene.noise_export_workers)
+        queue.clear_finished()
+
+        if self.source == 'ACTIVE':
+            image = None
+            if context.space_data and context.space_data.type == 'IMAGE_EDITOR':
+                image = context.space_data.image
+            image = image or bpy.data.images.get(scene.noise_generator_last_image)
+            if not image:
+                self.report({'ERROR'}, "No image to export")
+                return {'CANCELLED'}
+            # Reading pixels must happen here on the main thread, encoding runs in the workers
+            try:
+                regenerate_now(image)
+            except RuntimeError as error:
+                self.report({'ERROR'}, f"Couldn't regenerate {image.name}: {error}")
+                return {'CANCELLED'}
+            width, height = image.size
+            pixels = np.empty(width * height * 4, dtype=np.float32)
+            image.pixels.foreach_get(pixels)
+            queue.submit(
+                bpy.path.native_pathsep(directory + bpy.path.clean_name(image.name)),
+                scene.noise_export_format, pixels=pixels.reshape(height, width, 4)
+            )
+            count = 1
+        else:
+            images = [img for img in bpy.data.images if "noise_params" in img]
+            if not images:
+                self.report({'ERROR'}, "No noise images in this file")
+                return {'CANCELLED'}
+            for img in images:
+                params = img["noise_params"].to_dict()
+                # Every export worker may generate at the same time, each gets a share of the budget
+                queue.submit(
+                    bpy.path.native_pathsep(directory + bpy.path.clean_name(img.name)),
+                    scene.noise_export_format, params=params,
+                    band_height=band_height_for(scene, params, queue.workers)
+                )
+            count = len(images)
+
+        if not bpy.app.timers.is_registered(_poll_export_queue):
+            bpy.app.timers.register(_poll_export_queue, first_interval=0.25)
+        self.report({'INFO'}, f"Exporting {count} texture(s) to {directory}")
+        return {'FINISHED'}
+
+# Operator to Generate a Texture Larger than Memory
+class NOISE_OT_generate_to_disk(Operator):
+    bl_idname = "noise.generate_to_disk"
+    bl_label = "Generate to Disk"
+    bl_description = "Generate the panel settings at the disk size straight into the export directory, a band of rows at a time"
+
+    def execute(self, context):
+        from .export import get_export_queue
+        from . import out_of_core
+
+        scene = context.scene
+        params = params_from_scene(scene, scene.noise_disk_width, scene.noise_disk_height)
+        reason = out_of_core.unsupported_reason(params)
+        if reason:
+            self.report({'ERROR'}, reason)
+            return {'CANCELLED'}
+
+        queue = get_export_queue(scene.noise_export_workers)
+        queue.clear_finished()
+        # Every export worker may generate at the same time, each gets a share of the budget
+        band_height = out_of_core.band_height_for(params, scene.noise_memory_budget * 1024 * 1024 // queue.workers)
+        path = bpy.path.native_pathsep(bpy.path.abspath(scene.noise_export_dir) + bpy.path.clean_name(scene.noise_image_name))
+        queue.submit(
+            path, scene.noise_export_format, params=params, npy_path=path + ".npy", band_height=band_height,
+            tile_size=scene.noise_disk_tile_size, keep_npy=scene.noise_disk_keep_npy
+        )
+        if not bpy.app.timers.is_registered(_poll_export_queue):
+            bpy.app.timers.register(_poll_export_queue, first_interval=0.25)
+        self.report({'INFO'}, f"Generating {params['width']}x{params['height']} to {path}")
+        return {'FINISHED'}
+
 # Operator to Add Noise to Shader
 class NOISE_OT_add_to_shader(Operator):
     bl_idname = "noise.add_to_shader"
@@ -231,6 +775,12 @@ class NOISE_OT_add_to_shader(Operator):
     bl_description = "Connect generated image to active material"
     bl_options = {'REGISTER', 'UNDO'}
 
+    all_selected: BoolProperty(
+        name="All Selected Objects",
+        default=False,
+        description="Add the image to every material of all selected objects"
+    )
+
     def get_absolute_location(self, node):
         """Calculate absolute location considering all parent frames/groups"""
         abs_location = (node.location)
@@ -240,14 +790,24 @@ class NOISE_OT_add_to_shader(Operator):
             parent = parent.parent
         return abs_location
 
-    def find_parent_tree(self, node):
+    @staticmethod
+    def build_group_index():
+        """Map every node group (by pointer) to the group nodes using it, in one pass over the data"""
+        index = {}
+        trees = [mat.node_tree for mat in bpy.data.materials if mat.node_tree]
+        trees.extend(bpy.data.node_groups)
+        for tree in trees:
+            for n in tree.nodes:
+                if n.type == 'GROUP' and n.node_tree:
+                    index.setdefault(n.node_tree.as_pointer(), []).append(n)
+        return index
+
+    def find_parent_tree(self, node, group_index):
         """Find the root node tree through parent groups"""
         if node.id_data.users == 1:  # Check if it's a node group
-            for mat in bpy.data.materials:
-                if mat.node_tree:
-                    for n in mat.node_tree.nodes:
-                        if n.type == 'GROUP' and n.node_tree == node.id_data:
-                            return self.find_parent_tree(n)
+            users = group_index.get(node.id_data.as_pointer())
+            if users:
+                return self.find_parent_tree(users[0], group_index)
         return node.id_data
 
     def get_active_node(self, context):
@@ -264,33 +824,14 @@ class NOISE_OT_add_to_shader(Operator):
         
         return None
 
-    def execute(self, context):
-        if not hasattr(context.scene, 'noise_generator_last_image'):
-            self.report({'ERROR'}, "No generated image exists")
-            return {'CANCELLED'}
-        
-        image = bpy.data.images.get(context.scene.noise_generator_last_image)
-        if not image:
-            self.report({'ERROR'}, "Image not found")
-            return {'CANCELLED'}
-
-        obj = context.object
-        if not obj or not obj.active_material:
-            self.report({'ERROR'}, "No active object or material")
-            return {'CANCELLED'}
-
-        mat = obj.active_material
+    def attach_image(self, mat, image, active_node, group_index):
+        """Create an image texture node for image next to active_node (or the output) in mat"""
         mat.use_nodes = True
-        nodes = mat.node_tree.nodes
-        links = mat.node_tree.links
-
-        # Get the active node safely
-        active_node = self.get_active_node(context)
         node_tree = mat.node_tree
 
         # If inside a node group, find the parent tree
         if active_node and active_node.id_data != mat.node_tree:
-            node_tree = self.find_parent_tree(active_node)
+            node_tree = self.find_parent_tree(active_node, group_index)
 
         # Create texture node in the correct tree
         tex_node = node_tree.nodes.new('ShaderNodeTexImage')
@@ -320,8 +861,48 @@ class NOISE_OT_add_to_shader(Operator):
         # Ensure frame expansion
         if tex_node.parent and tex_node.parent.type == 'FRAME':
             tex_node.parent.update()
+        return tex_node
+
+    def execute(self, context):
+        if not hasattr(context.scene, 'noise_generator_last_image'):
+            self.report({'ERROR'}, "No generated image exists")
+            return {'CANCELLED'}
+        
+        image = bpy.data.images.get(context.scene.noise_generator_last_image)
+        if not image:
+            self.report({'ERROR'}, "Image not found")
+            return {'CANCELLED'}
+
+        group_index = self.build_group_index()
+
+        if self.all_selected:
+            # Every material of every selected object, each one once
+            materials = {}
+            for obj in context.selected_objects:
+                for slot in getattr(obj, "material_slots", ()):
+                    if slot.material:
+                        materials.setdefault(slot.material.as_pointer(), slot.material)
+            if not materials:
+                self.report({'ERROR'}, "No materials on selected objects")
+                return {'CANCELLED'}
+
+            active_mat = context.object.active_material if context.object else None
+            for mat in materials.values():
+                active_node = self.get_active_node(context) if mat == active_mat else None
+                if active_node is None and mat.node_tree:
+                    active_node = mat.node_tree.nodes.active
+                self.attach_image(mat, image, active_node, group_index)
+            self.report({'INFO'}, f"Added {image.name} to {len(materials)} materials")
+        else:
+            obj = context.object
+            if not obj or not obj.active_material:
+                self.report({'ERROR'}, "No active object or material")
+                return {'CANCELLED'}
+
+            # Get the active node safely
+            self.attach_image(obj.active_material, image, self.get_active_node(context), group_index)
 
         # Force UI update
         context.area.tag_redraw()
         
-        return {'FINISHED'}
\ No newline at end of file
+        return {'FINISHED'}
@@ -0,0 +1,69 @@
+"""Generation of textures larger than memory into memory-mapped .npy files.
+
+The generator writes a float32 working raster on disk one band of rows at a time, which
+is then quantized band by band into the final .npy in the image's storage format (FLOAT
+keeps the working raster). Only a band and the noise lattices are held in memory, so
+image size is limited by disk space. The result is read back as a memmap, which the
+encoders in export.py stream out in bands as well.
+"""
+import os
+import numpy as np
+from . import jit_kernels
+from .memory import lattice_bytes, num_channels, rows_within, MIN_BAND_ROWS
+from .noise_generators import OUT_OF_CORE_TYPES, STORAGE_DTYPES, _generate_float_raster, quantize_raster
+
+# Largest side of a texture generated to disk
+MAX_SIZE = 65536
+
+
+def unsupported_reason(params):
+    """Why params can't be generated out of core, or None if they can"""
+    if params["type"] not in OUT_OF_CORE_TYPES:
+        return f"{params['type']} noise needs the whole image in memory"
+    if params["type"] == "voronoii" and (params["use_color"] or params.get("smoothness", 0.0) > 0.0):
+        return "Voronoi cell colors and smoothing need the whole image in memory"
+    return None
+
+
+def band_height_for(params, budget):
+    """Rows per band so the noise lattices, a band of the working raster and its temporaries fit in budget bytes"""
+    channels = num_channels(params["use_color"], params["use_alpha"])
+    # Float32 working band and its quantized copy, on top of the generator's temporaries
+    rows = rows_within(budget, lattice_bytes(params), params, jit_kernels.enabled(), 4 * channels + 4 * channels)
+    return max(MIN_BAND_ROWS, min(params["height"], rows))
+
+
+def generate_to_file(params, path, band_height):
+    """Generate params into the .npy file at path and return it as a read-only memmap.
+
+    The file holds the compact raster (bottom row first, like generate_raster returns it).
+    """
+    reason = unsupported_reason(params)
+    if reason:
+        raise ValueError(reason)
+    storage = params.get("storage", 'BYTE')
+    shape = (params["height"], params["width"], num_channels(params["use_color"], params["use_alpha"]))
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    # Written under temporary names and renamed, so a .npy at path is always complete
+    work_path = f"{path}.{os.getpid()}.work.npy"
+    compact_path = f"{path}.{os.getpid()}.tmp.npy"
+    try:
+        raster = np.lib.format.open_memmap(work_path, mode='w+', dtype=np.float32, shape=shape)
+        _generate_float_raster(params, band_height, out=raster)
+        if storage == 'FLOAT':
+            raster.flush()
+            del raster
+            os.replace(work_path, path)
+        else:
+            compact = np.lib.format.open_memmap(compact_path, mode='w+', dtype=STORAGE_DTYPES[storage], shape=shape)
+            quantize_raster(raster, storage, out=compact)
+            compact.flush()
+            # Files must be closed before they are renamed or removed on Windows
+            del compact, raster
+            os.replace(compact_path, path)
+    finally:
+        for leftover in (work_path, compact_path):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+    return np.load(path, mmap_mode='r')
@@ -1,5 +1,7 @@
 import bpy
 from bpy.types import Panel
+from .utils import NoiseParamsUpdater
+from . import operators, jobs
 
 
 class NOISE_PT_main_panel(Panel):
@@ -18,15 +20,19 @@ class NOISE_PT_main_panel(Panel):
         layout = self.layout
         scene = context.scene
         img = context.space_data.image
+
+        # The panel is visible, so an Image Editor needs its settings synced from now on
+        NoiseParamsUpdater.start_polling()
         
         # Image Name, Overwrite and Generate Button
         box = layout.box()
         box.prop(scene, "noise_image_name", text="Name", expand=True)
         box.prop(scene, "noise_overwrite", text="Overwrite")
+        row = box.row(align=True)
         
         # Generate Button based on noise type
         if scene.noise_type == 'PERLIN':
-            op = box.operator("noise.generate_perlin", text="Generate Noise")
+            op = row.operator("noise.generate_perlin", text="Generate Noise")
             op.image_name = scene.noise_image_name
             op.overwrite = scene.noise_overwrite
             op.correct_aspect = scene.noise_correct_aspect
@@ -35,14 +41,21 @@ class NOISE_PT_main_panel(Panel):
             op.seed = scene.noise_seed
             op.period = scene.noise_period
             op.turbulence = scene.noise_turbulence
+            op.engine = scene.noise_engine
+            op.band_limited = scene.noise_band_limited
+            op.derivative_output = scene.noise_derivative_output
+            op.normal_strength = scene.noise_normal_strength
             op.depth = scene.noise_depth
             op.lacunarity = scene.noise_lacunarity
             op.atten = scene.noise_atten
             op.use_color = scene.noise_use_color
             op.use_alpha = scene.noise_use_alpha
             op.absolute = scene.noise_absolute
+            op.storage = scene.noise_storage
+            op.procedural = scene.noise_procedural
+            op.seed_mode = scene.noise_seed_mode
         else:  # VORONOII
-            op = box.operator("noise.generate_voronoii", text="Generate Noise")
+            op = row.operator("noise.generate_voronoii", text="Generate Noise")
             op.image_name = scene.noise_image_name
             op.overwrite = scene.noise_overwrite
             op.correct_aspect = scene.noise_correct_aspect
@@ -52,10 +65,16 @@ class NOISE_PT_main_panel(Panel):
             op.frequency = scene.noise_frequency
             op.return_type = scene.noise_return_type
             op.minkowski_exponent = scene.noise_minkowski_exponent
+            op.normalization = scene.noise_normalization
             op.smoothness = scene.noise_smoothness
             op.randomness = scene.noise_randomness
             op.use_color = scene.noise_use_color
             op.use_alpha = scene.noise_use_alpha
+            op.storage = scene.noise_storage
+            op.procedural = scene.noise_procedural
+            op.seed_mode = scene.noise_seed_mode
+            op.alpha_source = scene.noise_alpha_source
+        row.operator("noise.queue_generate", text="Queue")
         
         #Image settings
         box = layout.box()
@@ -64,6 +83,10 @@ class NOISE_PT_main_panel(Panel):
         col.prop(scene, "noise_correct_aspect", text="display as 1x1")
         col.prop(scene, "noise_width", text="Width")
         col.prop(scene, "noise_height", text="Height")
+        col.prop(scene, "noise_storage", text="Storage")
+        col.prop(scene, "noise_procedural", text="Procedural (don't pack)")
+        col.prop(scene, "noise_recipe_undo", text="Recipe undo")
+        col.prop(scene, "noise_memory_budget", text="Memory MB")
 
         # Noise Type
         box = layout.box()
@@ -71,20 +94,28 @@ class NOISE_PT_main_panel(Panel):
         col = box.column(align=True)
         col.prop(scene, "noise_type", text="Noise Type")
         col.prop(scene, "noise_seed", text = "Seed")
+        col.prop(scene, "noise_seed_mode", text = "Seed mode")
 
         # Noise-specific settings
         if scene.noise_type == 'PERLIN':
+            col.prop(scene, "noise_engine", text = "Engine")
             col.prop(scene, "noise_period", text = "Scale")
             col.prop(scene, "noise_turbulence", text = "Use depth")
             col.prop(scene, "noise_depth", text = "Depth details")
             col.prop(scene, "noise_lacunarity", text = "lacunarity")
             col.prop(scene, "noise_atten", text = "Mix details")
+            if scene.noise_engine == 'LATTICE':
+                col.prop(scene, "noise_band_limited", text = "Band limited")
+                col.prop(scene, "noise_derivative_output", text = "Output")
+                if scene.noise_derivative_output != 'NONE':
+                    col.prop(scene, "noise_normal_strength", text = "Strength")
         else:  # VORONOII
             col.prop(scene, "noise_frequency", text="Frequency")
             col.prop(scene, "noise_return_type", text="Return Type")
             # Only show Minkowski exponent when using Minkowski distance
             if scene.noise_return_type == '1' or scene.noise_return_type == '3':
                 col.prop(scene, "noise_minkowski_exponent", text="Minkowski p")
+            col.prop(scene, "noise_normalization", text="Normalization")
             col.prop(scene, "noise_smoothness", text="Smoothness")
             col.prop(scene, "noise_randomness", text="Randomness")
 
@@ -93,11 +124,76 @@ class NOISE_PT_main_panel(Panel):
         col = box.column(align=True)
         col.prop(scene, "noise_use_color", text = "RGB")
         col.prop(scene, "noise_use_alpha", text = "Alpha")
+        if scene.noise_type == 'VORONOII' and scene.noise_use_alpha:
+            col.prop(scene, "noise_alpha_source", text = "Alpha source")
         
         if scene.noise_type == 'PERLIN':
             col.prop(scene, "noise_absolute", text = "Groovy")
         
 
         
-        # Add to Shader Button
-        layout.operator("noise.add_to_shader")
\ No newline at end of file
+        box = layout.box()
+        box.label(text="Cache")
+        col = box.column(align=True)
+        col.prop(scene, "noise_cache_enabled", text="Use Cache")
+        if scene.noise_cache_enabled:
+            col.prop(scene, "noise_cache_dir", text="")
+            col.prop(scene, "noise_cache_size", text="Max MB")
+            col.operator("noise.clear_cache")
+        
+        box = layout.box()
+        box.label(text="Jobs")
+        col = box.column(align=True)
+        col.prop(scene, "noise_job_workers", text="Workers")
+        queue = jobs.current_queue()
+        if queue:
+            for job in queue.jobs:
+                row = col.row()
+                row.label(text=job.label)
+                row.label(text=f"{job.status.title()}  {job.seconds():.2f} s" if job.started else job.status.title())
+            col.operator("noise.clear_jobs")
+        
+        box = layout.box()
+        box.label(text="Export")
+        col = box.column(align=True)
+        col.prop(scene, "noise_export_dir", text="")
+        col.prop(scene, "noise_export_format", text="Format")
+        col.prop(scene, "noise_export_workers", text="Workers")
+        row = col.row(align=True)
+        row.operator("noise.export", text="Export Active").source = 'ACTIVE'
+        row.operator("noise.export", text="Export All").source = 'ALL'
+        col.separator()
+        col.prop(scene, "noise_disk_width", text="Disk Width")
+        col.prop(scene, "noise_disk_height", text="Disk Height")
+        col.prop(scene, "noise_disk_tile_size", text="Tile Size")
+        col.prop(scene, "noise_disk_keep_npy", text="Keep .npy")
+        col.operator("noise.generate_to_disk")
+        if operators.export_status:
+            col.label(text=operators.export_status)
+        
+        box = layout.box()
+        box.label(text="Animation")
+        col = box.column(align=True)
+        for index, track in enumerate(scene.noise_anim_tracks):
+            row = col.row(align=True)
+            row.prop(track, "enabled", text="")
+            row.label(text=track.image_name)
+            row.operator("noise.remove_animation_track", text="", icon='X').index = index
+            img = bpy.data.images.get(track.image_name)
+            noise_type = img["noise_params"].get("type") if img and "noise_params" in img else None
+            # Keyframe these like any other property
+            col.prop(track, "seed")
+            if noise_type != "voronoii":
+                col.prop(track, "period")
+            if noise_type in (None, "voronoii"):
+                col.prop(track, "frequency")
+            col.separator()
+        col.prop(scene, "noise_anim_cache_size", text="Frame cache MB")
+        row = col.row(align=True)
+        row.operator("noise.add_animation_track")
+        row.operator("noise.bake_animation")
+        
+        # Add to Shader Buttons
+        row = layout.row(align=True)
+        row.operator("noise.add_to_shader")
+        row.operator("noise.add_to_shader", text="Add to Selected").all_selected = True
\ No newline at end of file
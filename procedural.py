@@ -0,0 +1,173 @@
+"""Procedural noise images: saved with their noise_params only, pixels regenerated when needed.
+
+A procedural image is not packed, so the .blend only keeps the (blank) generated image
+and its parameters. After a file is loaded, procedural images in use are regenerated as
+background jobs (see jobs.py); an image shown in the Image Editor is requested on first
+display, and rendering waits for whatever is missing.
+"""
+import bpy
+from bpy.app.handlers import persistent
+
+# Pointers of procedural images whose pixels were generated in this session
+_filled = set()
+# Image pointer: job regenerating it, until it is applied
+_pending = {}
+
+
+def is_procedural(img):
+    return bool(img.get("noise_procedural")) and "noise_params" in img
+
+
+def needs_pixels(img):
+    return is_procedural(img) and img.as_pointer() not in _filled
+
+
+def mark_procedural(img, procedural):
+    """Store a freshly generated image procedurally (params only) or packed into the .blend
+
+    Returns the image to use from now on: a packed image can't become a generated one
+    again, so it is replaced by a new generated image.
+    """
+    if procedural:
+        if img.packed_file:
+            img = _generated_copy(img)
+        img["noise_procedural"] = True
+    else:
+        img.pack()
+        if "noise_procedural" in img:
+            del img["noise_procedural"]
+    _filled.add(img.as_pointer())
+    return img
+
+
+def _generated_copy(img):
+    """Replace img by a generated image with its name, pixels, custom properties and users"""
+    import numpy as np
+    from .noise_generators import get_image
+
+    name = img.name
+    width, height = img.size
+    pixels = np.empty(width * height * 4, dtype=np.float32)
+    img.pixels.foreach_get(pixels)
+    copy = get_image(name, width, height, False, img["noise_params"].get("storage", 'BYTE'))
+    copy.pixels.foreach_set(pixels)
+    copy.update()
+    copy.display_aspect = img.display_aspect
+    copy.colorspace_settings.name = img.colorspace_settings.name
+    for key in img.keys():
+        value = img[key]
+        copy[key] = value.to_dict() if hasattr(value, "to_dict") else value
+    # Materials and editors showing img show the copy instead
+    img.user_remap(copy)
+    bpy.data.images.remove(img)
+    copy.name = name
+    return copy
+
+
+def mark_filled(img):
+    """Record that img got its pixels by other means"""
+    _filled.add(img.as_pointer())
+
+
+def band_height_for(scene, params, share=1):
+    """Band height for regenerating params within 1/share of the scene's memory budget"""
+    from . import jit_kernels
+    from .memory import choose_band_height, MIN_BAND_ROWS
+
+    band_height = choose_band_height(params, scene.noise_memory_budget * 1024 * 1024 // share, jit_kernels.enabled())
+    # Over budget: regenerate with the smallest bands rather than leave the image blank
+    return band_height or MIN_BAND_ROWS
+
+
+def request(img):
+    """Queue the regeneration of img, unless it has its pixels or is queued already"""
+    pointer = img.as_pointer()
+    if not needs_pixels(img) or pointer in _pending:
+        return
+    from .jobs import get_job_queue
+    from .operators import texture_cache
+
+    scene = bpy.context.scene
+    name = img.name
+    params = img["noise_params"].to_dict()
+
+    def apply(raster):
+        _pending.pop(pointer, None)
+        _upload(pointer, name, params, raster)
+
+    def failed(_error):
+        # Let the next request try again
+        _pending.pop(pointer, None)
+
+    queue = get_job_queue(scene.noise_job_workers)
+    _pending[pointer] = queue.submit(
+        f"Regenerate {name}", params, apply, texture_cache(scene), band_height_for(scene, params, queue.workers),
+        failed
+    )
+
+
+def _upload(pointer, name, params, raster):
+    from .noise_generators import fill_image
+
+    img = bpy.data.images.get(name)
+    # Skip images renamed, removed or regenerated with other settings in the meantime
+    if img is None or img.as_pointer() != pointer or not needs_pixels(img) or img["noise_params"].to_dict() != params:
+        return
+    fill_image(img, raster, params)
+    _filled.add(pointer)
+
+
+def regenerate_now(img):
+    """Give img its pixels before returning, waiting for a queued regeneration if there is one"""
+    if not needs_pixels(img):
+        return
+    from .jobs import get_job_queue
+
+    queue = get_job_queue(bpy.context.scene.noise_job_workers)
+    # A job queued earlier may fail on its own, so a failure is retried once with a fresh job
+    for _attempt in range(2):
+        request(img)
+        job = _pending.get(img.as_pointer())
+        if job is None:
+            return
+        queue.apply_now(job)
+        if job.status != 'FAILED':
+            return
+    raise RuntimeError(job.error)
+
+
+@persistent
+def load_post(_dummy):
+    from .utils import NoiseParamsUpdater
+
+    # Pointers of the previous file mean nothing now
+    _filled.clear()
+    _pending.clear()
+    for img in bpy.data.images:
+        if is_procedural(img) and img.users > 0:
+            request(img)
+    # Images opened in an Image Editor later are requested on first display, also when
+    # the add-on's panel is never drawn. Restarting forgets the previous file's image.
+    NoiseParamsUpdater.stop_polling()
+    NoiseParamsUpdater.start_polling()
+
+
+@persistent
+def render_pre(_scene):
+    for img in bpy.data.images:
+        if needs_pixels(img):
+            try:
+                regenerate_now(img)
+            except Exception as error:
+                print(f"Regenerating {img.name} failed: {error}")
+
+
+def register_handlers():
+    bpy.app.handlers.load_post.append(load_post)
+    bpy.app.handlers.render_pre.append(render_pre)
+
+
+def unregister_handlers():
+    for handlers, handler in ((bpy.app.handlers.load_post, load_post), (bpy.app.handlers.render_pre, render_pre)):
+        if handler in handlers:
+            handlers.remove(handler)
@@ -0,0 +1,92 @@
+"""Undo and redo of generated images by recipe instead of pixel snapshots.
+
+With recipe undo on, generated images are stored procedurally, so Blender's undo steps
+only hold their noise_params. After an undo or redo step, the params of every tracked
+image are compared with the recipe of the pixels it shows; images that differ are
+refilled from an in-memory LRU of recent rasters, falling back to the disk cache and
+then to regenerating them.
+"""
+import bpy
+from bpy.app.handlers import persistent
+
+# Rasters of recent generations kept in memory for instant undo/redo
+MEMORY_BYTES = 512 * 1024 * 1024
+
+# Image name: (recipe key, image pointer) of the pixels the image currently shows
+_shown = {}
+_memory = None
+
+
+def memory_cache(scene):
+    """Shared in-memory raster cache, backed by the scene's disk cache when that is enabled"""
+    global _memory
+    from .cache import MemoryCache
+    from .noise_generators import GENERATOR_VERSION
+    from .operators import texture_cache
+
+    if _memory is None:
+        _memory = MemoryCache(MEMORY_BYTES, GENERATOR_VERSION)
+    _memory.backing = texture_cache(scene)
+    return _memory
+
+
+def _recipe(img):
+    from .cache import cache_key
+    from .noise_generators import GENERATOR_VERSION
+    return cache_key(img["noise_params"].to_dict(), GENERATOR_VERSION)
+
+
+def track(img):
+    """Record that img now shows the pixels of its noise_params"""
+    _shown[img.name] = (_recipe(img), img.as_pointer())
+
+
+def _restore_changed():
+    """Timer: refill tracked images whose params no longer match their pixels"""
+    from . import procedural
+    from .noise_generators import fill_image, load_or_generate
+
+    scene = bpy.context.scene
+    for img in bpy.data.images:
+        if img.name not in _shown or "noise_params" not in img:
+            continue
+        # A changed pointer means the undo system re-created the image, pixels included
+        if _shown[img.name] == (_recipe(img), img.as_pointer()):
+            continue
+        params = img["noise_params"].to_dict()
+        if tuple(img.size) != (params["width"], params["height"]):
+            continue
+        raster = load_or_generate(params, memory_cache(scene), procedural.band_height_for(scene, params))
+        fill_image(img, raster, params)
+        procedural.mark_filled(img)
+        track(img)
+    return None
+
+
+@persistent
+def undo_post(_scene):
+    if not _shown or not bpy.context.scene.noise_recipe_undo:
+        return
+    # Deferred, the undo system is still restoring data while handlers run
+    if not bpy.app.timers.is_registered(_restore_changed):
+        bpy.app.timers.register(_restore_changed, first_interval=0.0)
+
+
+@persistent
+def load_post(_dummy):
+    _shown.clear()
+    if _memory is not None:
+        _memory.clear()
+
+
+def register_handlers():
+    bpy.app.handlers.undo_post.append(undo_post)
+    bpy.app.handlers.redo_post.append(undo_post)
+    bpy.app.handlers.load_post.append(load_post)
+
+
+def unregister_handlers():
+    for handlers, handler in ((bpy.app.handlers.undo_post, undo_post), (bpy.app.handlers.redo_post, undo_post),
+                              (bpy.app.handlers.load_post, load_post)):
+        if handler in handlers:
+            handlers.remove(handler)
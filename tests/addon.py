@@ -0,0 +1,25 @@
+"""Import the add-on's modules outside Blender.
+
+The add-on's __init__.py registers Blender classes, so the modules are imported into
+a bare package instead. An empty bpy module is enough for what the tests call.
+"""
+import importlib
+import importlib.util
+import os
+import sys
+import types
+
+ADDON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Same package name as in Blender, so Numba's on-disk kernel cache stays valid
+PACKAGE = os.path.basename(ADDON_DIR)
+
+
+def import_addon_module(name):
+    """Import a module of the add-on without running its register code in __init__.py"""
+    if "bpy" not in sys.modules and importlib.util.find_spec("bpy") is None:
+        sys.modules["bpy"] = types.ModuleType("bpy")
+    if PACKAGE not in sys.modules:
+        package = types.ModuleType(PACKAGE)
+        package.__path__ = [ADDON_DIR]
+        sys.modules[PACKAGE] = package
+    return importlib.import_module(f"{PACKAGE}.{name}")
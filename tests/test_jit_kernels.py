@@ -0,0 +1,78 @@
+"""The Numba kernels must give the same pixels as the NumPy path they replace.
+
+Run `python -m pytest tests --rootdir=tests` from the add-on directory (or plain
+`python -m pytest` from tests), so pytest doesn't import the add-on's __init__.py,
+which needs Blender. Skipped when numba is not installed.
+"""
+import numpy as np
+import pytest
+
+from addon import import_addon_module
+
+pytest.importorskip("numba")
+
+noise_generators = import_addon_module("noise_generators")
+jit_kernels = import_addon_module("jit_kernels")
+
+WIDTH, HEIGHT = 96, 80
+
+
+def perlin(period, seed, use_color, use_alpha, absolute, **extra):
+    return dict(
+        type="perlin", width=WIDTH, height=HEIGHT, period=period, seed=seed,
+        use_color=use_color, use_alpha=use_alpha, absolute=absolute, **extra
+    )
+
+
+def turbulence(period, seed, depth, lacunarity, atten, use_color, use_alpha, absolute, **extra):
+    return dict(
+        type="turbulence", width=WIDTH, height=HEIGHT, period=period, seed=seed, depth=depth,
+        lacunarity=lacunarity, atten=atten, use_color=use_color, use_alpha=use_alpha, absolute=absolute, **extra
+    )
+
+
+def voronoi(frequency, seed, return_type, use_color, use_alpha, **extra):
+    return dict(
+        type="voronoii", width=WIDTH, height=HEIGHT, frequency=frequency, seed=seed,
+        return_type=return_type, use_color=use_color, use_alpha=use_alpha, **extra
+    )
+
+
+CASES = {
+    "perlin gray": perlin(16.0, 3, False, False, False),
+    "perlin color alpha": perlin(24.0, 5, True, True, True),
+    "turbulence color alpha": turbulence(32.0, 7, 4, 2.0, 0.5, True, True, False),
+    "voronoi euclidean color alpha": voronoi(6.0, 11, '0', True, True),
+    "voronoi minkowski 2.5": voronoi(5.5, 13, '3', False, True, randomness=0.8, minkowski_exponent=2.5),
+    "voronoi minkowski 2.5 color": voronoi(7.0, 17, '5', True, False, minkowski_exponent=2.5),
+    # Points on a regular grid: every 24th pixel column and 20th row is exactly halfway between
+    # two cell centers, so F1 ties F2 and the cell id (and color) depends on tie order
+    "voronoi grid ties": voronoi(4.0, 19, '2', True, True, randomness=0.0),
+    "voronoi grid ties minkowski": voronoi(4.0, 23, '1', True, False, randomness=0.0, minkowski_exponent=2.5),
+    "turbulence band limited": turbulence(32.0, 7, 5, 2.0, 0.6, False, False, True, band_limited=True),
+    "turbulence normal map": turbulence(32.0, 9, 3, 2.0, 0.5, True, False, False, derivative_output='NORMAL'),
+    "voronoi derived alpha": voronoi(6.0, 29, '2', True, True, smoothness=0.2, alpha_source='EDGE'),
+}
+
+
+@pytest.fixture
+def backend():
+    """Set jit_kernels.ENABLED for one test and restore it afterwards"""
+    saved = jit_kernels.ENABLED
+
+    def use(enabled):
+        jit_kernels.ENABLED = enabled
+
+    yield use
+    jit_kernels.ENABLED = saved
+
+
+@pytest.mark.parametrize("name", sorted(CASES))
+def test_jit_matches_numpy(backend, name):
+    params = CASES[name]
+    backend(True)
+    compiled = noise_generators.generate_pixels(params)
+    backend(False)
+    reference = noise_generators.generate_pixels(params)
+    assert compiled.shape == reference.shape
+    np.testing.assert_allclose(compiled, reference, rtol=0.0, atol=1e-5)
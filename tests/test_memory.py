@@ -0,0 +1,79 @@
+"""The memory estimates must cover what generating actually allocates, without
+overshooting so far that bands get needlessly small.
+
+Peaks are measured with tracemalloc on the NumPy path, which is what the estimates
+are calibrated against. Blender's own image buffer is not allocated here, so it is
+left out of the comparison. Run like test_jit_kernels.py.
+"""
+import tracemalloc
+
+import pytest
+
+from addon import import_addon_module
+
+noise_generators = import_addon_module("noise_generators")
+jit_kernels = import_addon_module("jit_kernels")
+memory = import_addon_module("memory")
+
+SIZE = 256
+# Estimates add up arrays that are alive in different steps, so they may overshoot by this much
+MAX_OVERESTIMATE = 2.5
+
+CASES = {
+    "perlin gray": noise_generators.perlin_params(SIZE, SIZE, 32.0, 3, False, False, False, True),
+    "perlin color alpha": noise_generators.perlin_params(SIZE, SIZE, 32.0, 3, True, True, False, True),
+    "perlin hashed": noise_generators.perlin_params(SIZE, SIZE, 4.0, 3, False, False, False, True, seed_mode='HASHED'),
+    "turbulence color alpha": noise_generators.turbulence_params(
+        SIZE, SIZE, 32.0, 3, 4, 2.0, 0.5, True, True, False, True
+    ),
+    # Lattices of the fine octaves outweigh the band temporaries
+    "turbulence small period": noise_generators.turbulence_params(
+        SIZE, SIZE, 8.0, 3, 3, 2.0, 0.5, True, False, False, True
+    ),
+    "turbulence normal map": noise_generators.turbulence_params(
+        SIZE, SIZE, 32.0, 3, 4, 2.0, 0.5, False, True, False, True, derivative_output='NORMAL'
+    ),
+    "voronoi cells": noise_generators.voronoii_params(SIZE, SIZE, 8.0, 3, '0', False, False, True),
+    "voronoi cells color alpha": noise_generators.voronoii_params(SIZE, SIZE, 8.0, 3, '0', True, True, True),
+    "voronoi cells edge": noise_generators.voronoii_params(
+        SIZE, SIZE, 8.0, 3, '0', False, True, True, alpha_source='EDGE'
+    ),
+    "voronoi smooth": noise_generators.voronoii_params(SIZE, SIZE, 8.0, 3, '0', False, False, True, smoothness=0.3),
+    "voronoi pixels": noise_generators.voronoii_params(
+        SIZE, SIZE, 200.0, 3, '3', False, True, True, minkowski_exponent=2.5
+    ),
+    "spectral": noise_generators.spectral_params(SIZE, SIZE, 32.0, 3, 4, 2.0, 0.5, False, False, False, True),
+}
+
+
+def measure_peak(params, band_height):
+    tracemalloc.start()
+    try:
+        noise_generators.generate_pixels(params, band_height)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.mark.parametrize("band_height", [None, 32])
+@pytest.mark.parametrize("name", sorted(CASES))
+def test_estimate_covers_peak(monkeypatch, name, band_height):
+    params = CASES[name]
+    monkeypatch.setattr(jit_kernels, "ENABLED", False)
+    # The first run compiles and caches what later runs reuse
+    noise_generators.generate_pixels(params, band_height)
+    measured = measure_peak(params, band_height)
+
+    estimate = memory.estimate_peak_bytes(params, band_height)
+    estimate -= SIZE * SIZE * memory.IMAGE_BUFFER_BYTES[params["storage"]]
+    assert measured <= estimate
+    assert estimate <= MAX_OVERESTIMATE * measured
+
+
+def test_band_height_fits_budget():
+    params = CASES["turbulence small period"]
+    budget = memory.estimate_peak_bytes(params, 64)
+    band_height = memory.choose_band_height(params, budget)
+    assert band_height == 64
+    assert memory.estimate_peak_bytes(params, band_height + 1) > budget
+    assert memory.choose_band_height(params, memory.fixed_bytes(params)) is None
@@ -1,4 +1,5 @@
 import bpy
+from . import procedural
 
 
 def update_display_aspect(self, context):
@@ -16,7 +17,12 @@ def update_display_aspect(self, context):
             
 
 class NoiseParamsUpdater:
-    print("NoiseParamsUpdater run")
+    """Syncs the panel settings with the noise_params of the image shown in an Image Editor.
+
+    Polling starts when a file is loaded (see procedural.load_post) or the first time the
+    panel is drawn, not when the add-on is registered. It also requests the pixels of
+    procedural images on first display.
+    """
     _timer = None
     _current_image = ""
     _last_area = None
@@ -24,8 +30,9 @@ class NoiseParamsUpdater:
     @classmethod
     def start_polling(cls):
         if cls._timer is None:
-            cls._timer = bpy.app.timers.register(cls.poll, persistent=True)
-            print("NoiseParamsUpdater initiated")
+            # Keep the exact bound method, unregister() looks it up by identity
+            cls._timer = cls.poll
+            bpy.app.timers.register(cls._timer, persistent=True)
 
     @classmethod
     def stop_polling(cls):
@@ -51,7 +58,10 @@ class NoiseParamsUpdater:
                         img = space.image
                         if img.name != cls._current_image:
                             cls._current_image = img.name
-                            if "noise_params" in img:
+                            # First display of a procedural image loaded without pixels
+                            procedural.request(img)
+                            # Composite images are baked from Python, the panel has no settings for them
+                            if "noise_params" in img and img["noise_params"].get("type") != "composite":
                                 params = img["noise_params"]
                                 scene = bpy.context.scene
                                 
@@ -60,9 +70,12 @@ class NoiseParamsUpdater:
                                 scene.noise_width = params["width"]
                                 scene.noise_height = params["height"]
                                 scene.noise_seed = params["seed"]
+                                scene.noise_seed_mode = params.get("seed_mode", 'SEQUENTIAL')
                                 scene.noise_use_color = params["use_color"]
                                 scene.noise_use_alpha = params["use_alpha"]
                                 scene.noise_correct_aspect = params["correct_aspect"]
+                                scene.noise_storage = params.get("storage", 'BYTE')
+                                scene.noise_procedural = procedural.is_procedural(img)
                                 
                                 # Set noise type based on params
                                 if "turbulence" in params:
@@ -70,18 +83,27 @@ class NoiseParamsUpdater:
                                     scene.noise_period = params["period"]
                                     scene.noise_absolute = params["absolute"]
                                     scene.noise_turbulence = params["turbulence"]
+                                    scene.noise_engine = params.get("engine", 'LATTICE')
+                                    scene.noise_derivative_output = params.get("derivative_output", 'NONE')
+                                    scene.noise_normal_strength = params.get("normal_strength", 1.0)
                                     
                                     if params["turbulence"]:
                                         scene.noise_depth = params["depth"]
                                         scene.noise_lacunarity = params["lacunarity"]
                                         scene.noise_atten = params["atten"]
+                                        scene.noise_band_limited = params.get("band_limited", False)
                                 else:
-                                    scene.noise_type = 'VORONOI'
+                                    scene.noise_type = 'VORONOII'
                                     scene.noise_frequency = params["frequency"]
                                     # Only set fbm_iterations if it exists in params (for backward compatibility)
                                     if "fbm_iterations" in params:
                                         scene.noise_fbm_iterations = params["fbm_iterations"]
                                     scene.noise_return_type = params["return_type"]
+                                    scene.noise_normalization = params.get("normalization", 'GLOBAL')
+                                    scene.noise_minkowski_exponent = params.get("minkowski_exponent", 3.0)
+                                    scene.noise_smoothness = params.get("smoothness", 0.0)
+                                    scene.noise_randomness = params.get("randomness", 1.0)
+                                    scene.noise_alpha_source = params.get("alpha_source", 'INDEPENDENT')
                                 
                                 # Update aspect ratio from params
                                 if "correct_aspect" in img["noise_params"]: